@@ -15,34 +15,68 @@ Requires environment variables:
     VERIFY_SSL: Optional, defaults to true
 """
 
+import functools
+import itertools
 import json
 import logging
 import logging.config
 import os
+import random
+import re
 import sys
+import threading
+import time
+import urllib.request
+import warnings
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Generator, Union
-from urllib.parse import urljoin
+from typing import Callable, Deque, Dict, List, Optional, Any, Generator, Iterable, Iterator, Sequence, Tuple, Type, Union
 
 import certifi
+import msgspec
 import requests
 import urllib3
 from requests.adapters import HTTPAdapter
-from requests.exceptions import RequestException
-from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from requests.exceptions import (
+    ChunkedEncodingError,
+    ContentDecodingError,
+    RequestException,
+    RetryError
+)
+from requests.packages.urllib3.exceptions import (
+    InsecureRequestWarning,
+    ProtocolError,
+    ReadTimeoutError
+)
 from requests.packages.urllib3.util.retry import Retry
 from tenacity import (
+    RetryCallState,
     retry,
     stop_after_attempt,
-    wait_exponential,
     before_log,
     after_log,
     retry_if_exception_type
 )
 
 from oaaclient.client import OAAClient, OAAClientError
-from oaaclient.templates import CustomApplication, OAAPermission, OAAPropertyType
+from oaaclient.templates import CustomApplication, LocalGroup, OAAPermission, OAAPropertyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # type: ignore[assignment]
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
 
 # Environment variable names
 SAILPOINT_TENANT = "SAILPOINT_TENANT"
@@ -57,10 +91,41 @@ MAX_LIMIT = 250  # Maximum items per API page
 BATCH_SIZE = 1000  # Items to process in memory at once
 MAX_RETRIES = 3
 RETRY_WAIT_MULTIPLIER = 1
-RETRY_WAIT_MIN = 4
+RETRY_WAIT_BASE = 0.1  # seconds
 RETRY_WAIT_MAX = 10
+RETRY_BACKOFF_JITTER = 0.5  # seconds of random jitter added to urllib3 backoff
 DEFAULT_TIMEOUT = 30  # seconds
-DEFAULT_RATE_LIMIT = 1.0  # seconds between requests
+DEFAULT_REQUESTS_PER_SECOND = 10.0  # SailPoint allows 100 requests per 10 seconds
+MIN_REQUESTS_PER_SECOND = 0.5  # Floor for the adaptive rate after repeated 429s
+RATE_RECOVERY_SUCCESSES = 10  # Consecutive successes before the rate is raised
+RATE_RECOVERY_STEP = 1.0  # Requests per second added on recovery
+_CA_BUNDLE = certifi.where()  # Resolved once; certifi looks the path up on each call
+
+# Headers for the OAuth token request
+TOKEN_REQUEST_HEADERS = {
+    'Accept': 'application/json',
+    'Content-Type': 'application/x-www-form-urlencoded',
+    'scope': 'sp:scope:all'
+}
+PAGE_FETCH_WORKERS = 8  # Concurrent page requests after the first page
+MAX_INFLIGHT_PAGES = 2 * PAGE_FETCH_WORKERS  # Pages fetched ahead of the consumer
+
+VECTORIZE_MIN_TIMESTAMPS = 1000  # Below this, per-value conversion is cheaper
+
+# dataclass(slots=True) is only available on Python 3.10+
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Millisecond range in which format_timestamp's float ts / 1000 is exact to the
+# microsecond (years 1833 to 2106), so the vectorized conversion agrees with it
+_MAX_VECTORIZED_TIMESTAMP_MS = 2 ** 32 * 1000
+
+# Leading date-time of an RFC 3339 timestamp, as returned by SailPoint
+_ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+# Errors raised while reading a streamed response body
+STREAM_ERRORS: Tuple[Type[Exception], ...] = (ProtocolError, ReadTimeoutError)
+if ijson is not None:
+    STREAM_ERRORS += (ijson.IncompleteJSONError,)
 
 # Configure logging
 logging.config.dictConfig({
@@ -109,7 +174,22 @@ SAILPOINT_ICON_B64 = (
     "TDc2LDc4LjZ6Ij4KICA8L3BhdGg+CiA8L2c+Cjwvc3ZnPg=="
 )
 
-@dataclass
+class RawIdentity(msgspec.Struct):
+    """
+    Schema for an identity as returned by the public-identities endpoint.
+    
+    Only the fields used by the connector are declared; the decoder skips
+    everything else in the response body.
+    """
+    id: Optional[str] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    status: Optional[str] = None
+    created: Optional[Union[int, float, str]] = None
+    lastLogin: Optional[Union[int, float, str]] = None
+    groups: Optional[List[Dict[str, Any]]] = None
+
+@dataclass(**DATACLASS_SLOTS)
 class IdentityData:
     """
     Data class representing a SailPoint identity.
@@ -132,12 +212,18 @@ class IdentityData:
     groups: List[Dict[str, str]] = field(default_factory=list)
 
     @classmethod
-    def from_api_response(cls, data: Dict[str, Any]) -> 'IdentityData':
+    def from_api_response(
+        cls,
+        data: RawIdentity,
+        timestamps: Optional[Tuple[Optional[str], Optional[str]]] = None
+    ) -> 'IdentityData':
         """
         Create an IdentityData instance from API response data.
         
         Args:
-            data: Raw API response dictionary
+            data: Identity decoded from the API response
+            timestamps: Optional (created, last_login) strings already
+                formatted for this identity by format_timestamps
             
         Returns:
             IdentityData instance
@@ -145,17 +231,20 @@ class IdentityData:
         Raises:
             ValueError: If required fields are missing
         """
-        if not data.get("id"):
+        if not data.id:
             raise ValueError("Identity must have an ID")
             
+        if timestamps is None:
+            timestamps = (format_timestamp(data.created), format_timestamp(data.lastLogin))
+            
         return cls(
-            id=data["id"],
-            name=data.get("name", ""),
-            email=data.get("email"),
-            status=data.get("status"),
-            created=format_timestamp(data.get("created")),
-            last_login=format_timestamp(data.get("lastLogin")),
-            groups=data.get("groups", [])
+            id=data.id,
+            name=data.name or "",
+            email=data.email,
+            status=data.status,
+            created=timestamps[0],
+            last_login=timestamps[1],
+            groups=data.groups or []
         )
 
 class SailPointError(Exception):
@@ -174,6 +263,10 @@ class APIError(SailPointError):
         self.status_code = status_code
         self.response = response
 
+class IncompleteResponseError(APIError):
+    """Exception for response bodies that were truncated or could not be parsed"""
+    pass
+
 def get_required_env_var(var_name: str) -> str:
     """
     Get a required environment variable or raise an error if it's not set.
@@ -208,10 +301,37 @@ def get_optional_env_var(var_name: str, default: Any) -> Any:
     """
     return os.getenv(var_name, default)
 
-def format_timestamp(ts: Optional[Union[int, str]]) -> Optional[str]:
+def wait_decorrelated_jitter(
+    base: float = RETRY_WAIT_BASE,
+    cap: float = RETRY_WAIT_MAX
+) -> Callable[[RetryCallState], float]:
+    """
+    Build a tenacity wait strategy using decorrelated jitter.
+    
+    Each sleep is drawn from [base, previous sleep * 3] and capped, so that
+    clients retrying at the same moment spread out instead of backing off
+    in lockstep.
+    
+    Args:
+        base: Minimum sleep in seconds
+        cap: Maximum sleep in seconds
+        
+    Returns:
+        Wait callable for tenacity's retry decorator
+    """
+    def wait(retry_state: RetryCallState) -> float:
+        previous = retry_state.upcoming_sleep or base
+        return min(cap, random.uniform(base, previous * 3))
+    
+    return wait
+
+@functools.lru_cache(maxsize=4096)
+def format_timestamp(ts: Optional[Union[int, float, str]]) -> Optional[str]:
     """
     Format timestamp to ISO format.
     
+    Results are cached, since many identities share the same timestamps.
+    
     Args:
         ts: Unix timestamp in milliseconds or ISO string
         
@@ -223,15 +343,141 @@ def format_timestamp(ts: Optional[Union[int, str]]) -> Optional[str]:
         
     try:
         if isinstance(ts, str):
+            # SailPoint returns RFC 3339 strings; only parse odd shapes
+            if _ISO_RE.match(ts):
+                return ts
             # If it's already an ISO string, validate and return
             datetime.fromisoformat(ts.replace('Z', '+00:00'))
             return ts
         # Convert milliseconds to ISO
         return datetime.fromtimestamp(ts/1000, timezone.utc).isoformat()
     except Exception as e:
-        logger.warning(f"Error formatting timestamp {ts}: {e}")
+        logger.warning("Error formatting timestamp %s: %s", ts, e)
         return None
 
+def chunks(iterable: Iterable[Any], size: int) -> Generator[List[Any], None, None]:
+    """
+    Split an iterable into lists of at most `size` items.
+    
+    Args:
+        iterable: Items to split
+        size: Maximum number of items per list
+        
+    Yields:
+        Consecutive lists of items
+    """
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+def format_timestamps(
+    values: Sequence[Optional[Union[int, float, str]]]
+) -> List[Optional[str]]:
+    """
+    Format a batch of timestamps to ISO format.
+    
+    When NumPy is installed and the batch holds at least
+    VECTORIZE_MIN_TIMESTAMPS integer millisecond values, those are converted
+    in one vectorized pass. The output matches format_timestamp exactly.
+    Everything else, including integers too far from 1970 for
+    format_timestamp's float conversion to be exact, goes through
+    format_timestamp.
+    
+    Args:
+        values: Unix timestamps in milliseconds or ISO strings
+        
+    Returns:
+        List of ISO formatted timestamps (None for invalid input)
+    """
+    vectorized = [
+        type(ts) is int and ts != 0
+        and -_MAX_VECTORIZED_TIMESTAMP_MS < ts < _MAX_VECTORIZED_TIMESTAMP_MS
+        for ts in values
+    ]
+    positions = [i for i, v in enumerate(vectorized) if v]
+    if np is None or len(positions) < VECTORIZE_MIN_TIMESTAMPS:
+        return [format_timestamp(ts) for ts in values]
+        
+    formatted = [None if v else format_timestamp(ts) for ts, v in zip(values, vectorized)]
+    
+    millis = np.fromiter((values[i] for i in positions), dtype=np.int64, count=len(positions))
+    stamps = (millis * 1000).astype('datetime64[us]')
+    # datetime.isoformat() omits the fraction when it is zero
+    iso = np.char.add(
+        np.where(
+            millis % 1000 == 0,
+            np.datetime_as_string(stamps, unit='s'),
+            np.datetime_as_string(stamps, unit='us')
+        ),
+        '+00:00'
+    )
+    for i, ts in zip(positions, iso.tolist()):
+        formatted[i] = ts
+        
+    return formatted
+
+class RateLimiter:
+    """
+    Thread-safe token bucket whose refill rate adapts to API throttling.
+    
+    Tokens refill continuously at `rate` per second up to `burst`. The rate
+    is halved whenever the API throttles a request and raised additively
+    after RATE_RECOVERY_SUCCESSES consecutive successes (AIMD).
+    """
+    
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            rate: Maximum requests per second
+            burst: Maximum number of requests dispatched back to back
+            clock: Monotonic clock in seconds
+            sleep: Function used to wait for the next token
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._successes = 0
+        self._lock = threading.Lock()
+        
+    def acquire(self) -> None:
+        """Block until a request may be dispatched."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+            
+    def throttled(self) -> None:
+        """Halve the rate after the API throttled a request."""
+        with self._lock:
+            self.rate = max(MIN_REQUESTS_PER_SECOND, self.rate / 2)
+            self._successes = 0
+            
+    def succeeded(self) -> None:
+        """Record a successful request, recovering the rate when due."""
+        with self._lock:
+            self._successes += 1
+            if self._successes >= RATE_RECOVERY_SUCCESSES:
+                self.rate = min(self.max_rate, self.rate + RATE_RECOVERY_STEP)
+                self._successes = 0
+
 class SailPointOAAProvider:
     """
     OAA Provider for SailPoint IdentityNow integration.
@@ -239,63 +485,79 @@ class SailPointOAAProvider:
     """
     
     def __init__(self, oaa_client: OAAClient, verify_ssl: bool = True,
-                 rate_limit: float = DEFAULT_RATE_LIMIT):
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 rate_limit: Optional[float] = None):
         """
         Initialize the SailPoint OAA Provider.
         
         Args:
             oaa_client: OAA client instance
             verify_ssl: Whether to verify SSL certificates
-            rate_limit: Minimum seconds between API calls
+            requests_per_second: Maximum API calls per second
+            rate_limit: Deprecated; minimum seconds between API calls.
+                Overrides requests_per_second when given.
         """
+        if rate_limit is not None:
+            warnings.warn(
+                "rate_limit is deprecated, use requests_per_second instead",
+                DeprecationWarning,
+                stacklevel=2
+            )
+            requests_per_second = 1 / rate_limit
+            
         self.tenant = get_required_env_var(SAILPOINT_TENANT)
         self.client_id = get_required_env_var(SAILPOINT_CLIENT_ID)
         self.client_secret = get_required_env_var(SAILPOINT_CLIENT_SECRET)
         self.oaa_client = oaa_client
+        self._identity_decoder = msgspec.json.Decoder(List[RawIdentity])
+        self._group_cache: Dict[str, LocalGroup] = {}
         self._setup_session(verify_ssl)
-        self.rate_limit = rate_limit
-        self._last_request_time = 0
+        self._rate_limiter = RateLimiter(requests_per_second, PAGE_FETCH_WORKERS)
         
         # Set up base URLs
         self.api_base_url = f"https://{self.tenant}.api.identitynow.com"
-        self.token_url = urljoin(self.api_base_url, "/oauth/token")
-        
-        self.logger = logging.getLogger(__name__)
+        self.token_url = f"{self.api_base_url}/oauth/token"
+        self._v3_base = f"{self.api_base_url}/v3/"
 
     def _setup_session(self, verify_ssl: bool) -> None:
         """Configure requests session with proper SSL and retry settings."""
         self.session = requests.Session()
+        self.session.headers['Accept'] = 'application/json'
         
         if not verify_ssl:
             self.session.verify = False
             urllib3.disable_warnings(InsecureRequestWarning)
         else:
-            self.session.verify = certifi.where()
+            self.session.verify = _CA_BUNDLE
+            
+        # Without proxy or CA bundle overrides in the environment, skip the
+        # per-request environment lookups; otherwise keep honouring them
+        if not urllib.request.getproxies() and not any(
+            os.environ.get(var) for var in ('REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE')
+        ):
+            self.session.trust_env = False
             
         # Configure retry strategy
         retry_strategy = Retry(
             total=MAX_RETRIES,
             backoff_factor=RETRY_WAIT_MULTIPLIER,
+            backoff_jitter=RETRY_BACKOFF_JITTER,
             status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"]
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=True
         )
         
+        # One keep-alive connection per page-fetch worker; blocking on a
+        # full pool reuses a warm connection instead of handshaking a new
+        # one that would be discarded afterwards
         adapter = HTTPAdapter(
             max_retries=retry_strategy,
-            pool_connections=100,
-            pool_maxsize=100
+            pool_connections=1,
+            pool_maxsize=PAGE_FETCH_WORKERS,
+            pool_block=True
         )
         self.session.mount("https://", adapter)
 
-    @retry(
-        stop=stop_after_attempt(MAX_RETRIES),
-        wait=wait_exponential(multiplier=RETRY_WAIT_MULTIPLIER, 
-                            min=RETRY_WAIT_MIN,
-                            max=RETRY_WAIT_MAX),
-        retry=retry_if_exception_type(RequestException),
-        before=before_log(logger, logging.DEBUG),
-        after=after_log(logger, logging.DEBUG)
-    )
     def authenticate(self) -> None:
         """
         Authenticate with SailPoint IdentityNow and get access token.
@@ -304,7 +566,7 @@ class SailPointOAAProvider:
             APIError: If authentication fails
         """
         try:
-            self.logger.debug(f"Attempting authentication to {self.token_url}")
+            logger.debug("Attempting authentication to %s", self.token_url)
             
             data = {
                 'grant_type': 'client_credentials',
@@ -312,28 +574,19 @@ class SailPointOAAProvider:
                 'client_secret': self.client_secret
             }
             
-            headers = {
-                'Accept': 'application/json',
-                'Content-Type': 'application/x-www-form-urlencoded',
-                'scope': 'sp:scope:all'
-            }
-            
             response = self.session.post(
                 self.token_url,
                 data=data,
-                headers=headers,
+                headers=TOKEN_REQUEST_HEADERS,
                 timeout=DEFAULT_TIMEOUT
             )
             
             response.raise_for_status()
-            token_data = response.json()
+            token_data = self._decode(response)
             
-            self.session.headers.update({
-                'Authorization': f'Bearer {token_data["access_token"]}',
-                'Accept': 'application/json'
-            })
+            self.session.headers['Authorization'] = f'Bearer {token_data["access_token"]}'
             
-            self.logger.info("Successfully authenticated to SailPoint")
+            logger.info("Successfully authenticated to SailPoint")
             
         except RequestException as e:
             raise APIError(
@@ -341,8 +594,61 @@ class SailPointOAAProvider:
                 status_code=getattr(e.response, 'status_code', None),
                 response=getattr(e, 'response', None)
             )
+        except ValueError as e:
+            raise APIError(f"Authentication failed: invalid token response: {str(e)}")
 
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+    @staticmethod
+    def _decode(response: requests.Response) -> Any:
+        """
+        Decode a JSON response body.
+        
+        Uses orjson when it is installed and falls back to the stdlib decoder.
+        Both read the raw bytes, skipping the charset detection that
+        response.json() runs on the body.
+        
+        Args:
+            response: Response object to decode
+            
+        Returns:
+            Decoded JSON document
+        """
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return json.loads(response.content)
+
+    @staticmethod
+    def _iter_items(response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """
+        Incrementally parse the items of a streamed JSON array response.
+        
+        Args:
+            response: Response object requested with stream=True
+            
+        Returns:
+            Iterator over the decoded array items
+        """
+        response.raw.decode_content = True
+        return ijson.items(response.raw, 'item', use_float=True)
+
+    @staticmethod
+    def _was_throttled(response: requests.Response) -> bool:
+        """
+        Check whether a response was throttled, including retried attempts.
+        
+        Args:
+            response: Response returned by the session
+            
+        Returns:
+            True if the API answered 429 for this request
+        """
+        if response.status_code == 429:
+            return True
+        retries = getattr(response.raw, 'retries', None)
+        return retries is not None and any(
+            attempt.status == 429 for attempt in retries.history
+        )
+
+    def _make_request(self, method: str, endpoint: str, **kwargs: Any) -> requests.Response:
         """
         Make an API request with rate limiting and error handling.
         
@@ -357,7 +663,8 @@ class SailPointOAAProvider:
         Raises:
             APIError: If the request fails
         """
-        url = urljoin(self.api_base_url, f"/v3/{endpoint}")
+        url = self._v3_base + endpoint
+        self._rate_limiter.acquire()
         
         try:
             response = self.session.request(
@@ -366,23 +673,131 @@ class SailPointOAAProvider:
                 timeout=DEFAULT_TIMEOUT,
                 **kwargs
             )
+            if self._was_throttled(response):
+                self._rate_limiter.throttled()
+            else:
+                self._rate_limiter.succeeded()
             response.raise_for_status()
             return response
             
+        except (ChunkedEncodingError, ContentDecodingError) as e:
+            raise IncompleteResponseError(f"Incomplete response body: {str(e)}")
         except RequestException as e:
+            # The adapter retries 429s itself, so exhausted retries surface
+            # as RetryError without a response
+            if isinstance(e, RetryError):
+                self._rate_limiter.throttled()
             raise APIError(
                 f"API request failed: {str(e)}",
                 status_code=getattr(e.response, 'status_code', None),
                 response=getattr(e, 'response', None)
             )
 
-    def get_paginated_results(self, endpoint: str, query: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+    def _page_params(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the query parameters shared by every page of a listing.
+        
+        Args:
+            query: Base query parameters
+            
+        Returns:
+            Parameter dictionary without an offset
+        """
+        params = {
+            'limit': min(query.get('limit', MAX_LIMIT), MAX_LIMIT)
+        }
+        
+        # Add any additional query parameters
+        if filters := query.get('filters'):
+            params['filters'] = filters
+        if sorters := query.get('sorters'):
+            params['sorters'] = sorters
+            
+        return params
+
+    @retry(
+        stop=stop_after_attempt(MAX_RETRIES),
+        wait=wait_decorrelated_jitter(),
+        retry=retry_if_exception_type(IncompleteResponseError),
+        before=before_log(logger, logging.DEBUG),
+        after=after_log(logger, logging.DEBUG),
+        reraise=True
+    )
+    def _fetch_page(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        offset: int,
+        decoder: Optional[msgspec.json.Decoder] = None,
+        count: bool = False
+    ) -> Tuple[List[Any], int]:
+        """
+        Fetch and decode a single page of results.
+        
+        Status and connection failures are retried by the session adapter;
+        bodies that arrive truncated or malformed are retried here.
+        
+        Args:
+            endpoint: API endpoint to query
+            params: Page parameters from _page_params
+            offset: Offset of the first item on the page
+            decoder: Optional msgspec decoder for a typed page schema
+            count: Ask the API for X-Total-Count. This costs the server an
+                extra count query, so only the first page requests it.
+            
+        Returns:
+            Tuple of the page items and the X-Total-Count header value
+            (0 when not requested)
+            
+        Raises:
+            APIError: If the request fails or the page cannot be decoded
+        """
+        try:
+            page_params = {**params, 'offset': offset}
+            if count:
+                page_params['count'] = 'true'
+            response = self._make_request('GET', endpoint, params=page_params)
+            try:
+                if decoder is not None:
+                    items = decoder.decode(response.content)
+                else:
+                    items = self._decode(response)
+            except msgspec.ValidationError as e:
+                raise APIError(f"Invalid response from {endpoint}: {str(e)}")
+            except ValueError as e:
+                raise IncompleteResponseError(
+                    f"Malformed response from {endpoint}: {str(e)}"
+                )
+            return items, int(response.headers.get('X-Total-Count', 0))
+            
+        except APIError as e:
+            logger.error("Failed to fetch page at offset %d: %s", offset, e)
+            raise
+
+    def get_paginated_results(
+        self,
+        endpoint: str,
+        query: Dict[str, Any],
+        decoder: Optional[msgspec.json.Decoder] = None,
+        stream: bool = False
+    ) -> Generator[Any, None, None]:
         """
         Get paginated results from the SailPoint API.
         
+        The first page is fetched synchronously to read X-Total-Count; the
+        remaining pages are then requested concurrently, at most
+        MAX_INFLIGHT_PAGES ahead of the consumer, and their items are
+        yielded in page order.
+        
         Args:
             endpoint: API endpoint to query
             query: Base query parameters
+            decoder: Optional msgspec decoder for a typed page schema. When
+                omitted, pages are decoded into plain dictionaries.
+            stream: Parse each page incrementally off the socket with ijson
+                instead of buffering the whole body. Pages are then fetched
+                one at a time. Ignored when a decoder is given or ijson is
+                not installed.
                 
         Yields:
             Individual items from the API response
@@ -390,57 +805,121 @@ class SailPointOAAProvider:
         Raises:
             APIError: If API request fails
         """
+        params = self._page_params(query)
+        
+        if stream and decoder is None and ijson is not None:
+            yield from self._stream_pages(endpoint, params)
+            return
+            
+        limit = params['limit']
+        items, total = self._fetch_page(endpoint, params, 0, decoder, count=True)
+        yield from items
+        total_processed = len(items)
+        
+        if total_processed < limit or total_processed >= total:
+            return
+            
+        offsets = iter(range(limit, total, limit))
+        pending: Deque[Future] = deque()
+        
+        with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+            try:
+                for offset in itertools.islice(offsets, MAX_INFLIGHT_PAGES):
+                    pending.append(executor.submit(
+                        self._fetch_page, endpoint, params, offset, decoder
+                    ))
+                    
+                while pending:
+                    items, _ = pending.popleft().result()
+                    
+                    # Keep the pool busy before handing items back
+                    for offset in itertools.islice(offsets, 1):
+                        pending.append(executor.submit(
+                            self._fetch_page, endpoint, params, offset, decoder
+                        ))
+                        
+                    yield from items
+                    total_processed += len(items)
+                    
+                    # Log progress for large result sets
+                    if total_processed % 1000 == 0:
+                        logger.info("Processed %d of %d items", total_processed, total)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _stream_pages(
+        self,
+        endpoint: str,
+        params: Dict[str, Any]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Fetch pages one at a time, parsing each response body incrementally.
+        
+        Args:
+            endpoint: API endpoint to query
+            params: Page parameters from _page_params
+            
+        Yields:
+            Individual items from the API response
+            
+        Raises:
+            APIError: If API request fails
+        """
+        limit = params['limit']
         offset = 0
         total_processed = 0
+        stream_retries = 0
         
         while True:
-            params = {
-                'limit': min(query.get('limit', MAX_LIMIT), MAX_LIMIT),
-                'offset': offset,
-                'count': 'true'
-            }
-            
-            # Add any additional query parameters
-            if filters := query.get('filters'):
-                params['filters'] = filters
-            if sorters := query.get('sorters'):
-                params['sorters'] = sorters
-                
             try:
                 # Make API request
-                response = self._make_request('GET', endpoint, params=params)
-                
-                # Get items and total count
-                items = response.json()
-                total = int(response.headers.get('X-Total-Count', 0))
+                response = self._make_request(
+                    'GET', endpoint, params={**params, 'offset': offset}, stream=True
+                )
                 
-                if not items:
-                    break
-                    
                 # Yield individual items
-                for item in items:
-                    yield item
-                    total_processed += 1
+                count = 0
+                try:
+                    for item in self._iter_items(response):
+                        yield item
+                        count += 1
+                        total_processed += 1
+                except STREAM_ERRORS as e:
+                    # The stream broke mid-page; resume after the last item
+                    # that was yielded rather than replaying the page.
+                    if stream_retries >= MAX_RETRIES:
+                        raise APIError(
+                            f"Response stream from {endpoint} was truncated: {str(e)}"
+                        )
+                    stream_retries += 1
+                    logger.warning(
+                        "Response stream truncated at offset %d, resuming", offset + count
+                    )
+                    offset += count
+                    continue
+                finally:
+                    response.close()
                     
                 # Log progress for large result sets
-                if total_processed % 1000 == 0:
-                    self.logger.info(f"Processed {total_processed} of {total} items")
+                if count and total_processed % 1000 == 0:
+                    logger.info("Processed %d items", total_processed)
                 
-                # Check if we've processed everything
-                offset += len(items)
-                if offset >= total:
+                # A short page means there is nothing left to fetch
+                offset += count
+                if count < limit:
                     break
                     
             except APIError as e:
-                self.logger.error(f"Failed to fetch page at offset {offset}: {str(e)}")
+                logger.error("Failed to fetch page at offset %d: %s", offset, e)
                 raise
 
-    def fetch_identities(self) -> List[Dict[str, Any]]:
+    def fetch_identities(self) -> List[RawIdentity]:
         """
         Fetch all identities from SailPoint.
         
         Returns:
-            List of identity dictionaries
+            List of decoded identities
             
         Raises:
             APIError: If fetching fails
@@ -449,43 +928,60 @@ class SailPointOAAProvider:
         query = {'limit': MAX_LIMIT}
         
         try:
-            for identity in self.get_paginated_results('public-identities', query):
+            for identity in self.get_paginated_results(
+                'public-identities', query, decoder=self._identity_decoder
+            ):
                 identities.append(identity)
                 
-            self.logger.info(f"Fetched {len(identities)} identities")
+            logger.info("Fetched %d identities", len(identities))
             return identities
             
         except APIError as e:
-            self.logger.error(f"Failed to fetch identities: {str(e)}")
+            logger.error("Failed to fetch identities: %s", e)
             raise
 
     def process_identities_batch(
         self,
         provider_data: CustomApplication,
-        identities: List[Dict[str, Any]]
+        identities: List[RawIdentity]
     ) -> None:
         """
         Process a batch of identities and add them to the provider data.
         
         Args:
             provider_data: CustomApplication instance to add users to
-            identities: List of identity dictionaries to process
+            identities: List of decoded identities to process
             
         Raises:
             ValueError: If batch processing fails
         """
-        processed = 0
-        errors = 0
+        processed: int = 0
+        errors: int = 0
+        group_cache: Dict[str, LocalGroup] = self._group_cache
+        
+        # Bind hot-loop attribute lookups to locals
+        from_api_response = IdentityData.from_api_response
+        add_user = provider_data.add_local_user
+        add_group = provider_data.add_local_group
+        warn = logger.warning
+        
+        # Format the batch's timestamps up front so numeric values can be
+        # converted in a single pass
+        timestamps = zip(
+            format_timestamps([raw.created for raw in identities]),
+            format_timestamps([raw.lastLogin for raw in identities])
+        )
         
-        for raw_identity in identities:
+        for raw_identity, identity_timestamps in zip(identities, timestamps):
             try:
                 # Parse and validate identity data
-                identity = IdentityData.from_api_response(raw_identity)
+                identity = from_api_response(raw_identity, identity_timestamps)
+                email = identity.email
                 
                 # Create or update user
-                user = provider_data.add_local_user(
+                user = add_user(
                     name=identity.name,
-                    identities=[identity.email] if identity.email else [],
+                    identities=[email] if email else [],
                     unique_id=identity.id
                 )
                 
@@ -494,30 +990,38 @@ class SailPointOAAProvider:
                 user.created_at = identity.created
                 user.last_login_at = identity.last_login
                 
-                # Set custom properties
-                user.set_property("sailpoint_id", identity.id)
-                if identity.email:
-                    user.set_property("email", identity.email)
-                if identity.status:
-                    user.set_property("status", identity.status)
+                # Set custom properties, skipping empty values
+                for property_name, value in (
+                    ("sailpoint_id", identity.id),
+                    ("email", email),
+                    ("status", identity.status)
+                ):
+                    if value:
+                        user.set_property(property_name, value)
                 
                 # Process groups
                 for group in identity.groups:
                     if group_name := group.get("name"):
+                        # local_groups is keyed by unique_id, so memberships must use it too
+                        group_id = group.get("id") or group_name
+                        # local_groups ignores case; ids differing only in case are one group
+                        group_key = group_id.lower()
                         try:
-                            if group_name not in provider_data.local_groups:
-                                provider_data.add_local_group(
+                            local_group = group_cache.get(group_key)
+                            if local_group is None:
+                                local_group = group_cache[group_key] = add_group(
                                     name=group_name,
-                                    unique_id=group.get("id", group_name)
+                                    unique_id=group_id
                                 )
-                            user.add_group(group_name)
+                            user.add_group(local_group.unique_id)
                         except Exception as e:
-                            self.logger.warning(
-                                f"Error adding user {identity.id} to group {group_name}: {str(e)}"
+                            warn(
+                                "Error adding user %s to group %s: %s",
+                                identity.id, group_name, e
                             )
                 
                 # Add permissions if email exists
-                if identity.email:
+                if email:
                     user.add_permission(
                         permission="access",
                         apply_to_application=True
@@ -526,19 +1030,19 @@ class SailPointOAAProvider:
                 processed += 1
                     
             except ValueError as e:
-                self.logger.error(f"Invalid identity data: {str(e)}")
+                logger.error("Invalid identity data: %s", e)
                 errors += 1
             except Exception as e:
-                self.logger.error(f"Error processing identity: {str(e)}")
+                logger.error("Error processing identity: %s", e)
                 errors += 1
                 
-        self.logger.info(
-            f"Processed {processed} identities with {errors} errors"
+        logger.info(
+            "Processed %d identities with %d errors", processed, errors
         )
         
         if errors > 0:
-            self.logger.warning(
-                f"Encountered {errors} errors while processing identities"
+            logger.warning(
+                "Encountered %d errors while processing identities", errors
             )
 
     def sync(self, force: bool = False) -> None:
@@ -568,33 +1072,33 @@ class SailPointOAAProvider:
             
             # Create base provider payload
             provider_data = self._create_provider_data()
+            self._group_cache.clear()
             
             # Fetch and process identities
-            self.logger.info("Fetching identities...")
-            identities = self.fetch_identities()
-            
-            # Process identities in batches
-            total_identities = len(identities)
-            self.logger.info(
-                f"Processing {total_identities} identities in batches of {BATCH_SIZE}"
+            logger.info("Fetching identities...")
+            identities = self.get_paginated_results(
+                'public-identities',
+                {'limit': MAX_LIMIT},
+                decoder=self._identity_decoder
             )
             
-            for i in range(0, total_identities, BATCH_SIZE):
-                batch = identities[i:i + BATCH_SIZE]
-                self.logger.debug(
-                    f"Processing batch {i//BATCH_SIZE + 1} of "
-                    f"{(total_identities + BATCH_SIZE - 1)//BATCH_SIZE}"
-                )
+            # Process identities in batches as pages arrive
+            logger.info("Processing identities in batches of %d", BATCH_SIZE)
+            total_identities = 0
+            
+            for batch_number, batch in enumerate(chunks(identities, BATCH_SIZE), 1):
+                logger.debug("Processing batch %d", batch_number)
                 self.process_identities_batch(provider_data, batch)
+                total_identities += len(batch)
         
-            self.logger.info(f"Processed {total_identities} identities")
+            logger.info("Processed %d identities", total_identities)
             
             # Push data to OAA
             self._push_to_oaa(provider_name, data_source_name, provider_data)
             
         except Exception as e:
-            self.logger.error(f"Sync failed: {str(e)}")
-            self.logger.debug("Exception details:", exc_info=True)
+            logger.error("Sync failed: %s", e)
+            logger.debug("Exception details:", exc_info=True)
             raise
 
     def _get_or_create_provider(self, provider_name: str) -> Dict[str, Any]:
@@ -609,12 +1113,12 @@ class SailPointOAAProvider:
         """
         provider = self.oaa_client.get_provider(provider_name)
         if not provider:
-            self.logger.info(f"Creating new provider: {provider_name}")
+            logger.info("Creating new provider: %s", provider_name)
             provider = self.oaa_client.create_provider(
                 name=provider_name,
                 custom_template="application"
             )
-            self.logger.info(f"Created provider with ID: {provider['id']}")
+            logger.info("Created provider with ID: %s", provider['id'])
             
             # Set provider icon if available
             if SAILPOINT_ICON_B64:
@@ -624,9 +1128,9 @@ class SailPointOAAProvider:
                         SAILPOINT_ICON_B64
                     )
                 except Exception as e:
-                    self.logger.warning(f"Failed to update provider icon: {e}")
+                    logger.warning("Failed to update provider icon: %s", e)
         else:
-            self.logger.info(f"Found existing provider: {provider_name}")
+            logger.info("Found existing provider: %s", provider_name)
             
         return provider
 
@@ -682,7 +1186,7 @@ class SailPointOAAProvider:
         Raises:
             OAAClientError: If push fails
         """
-        self.logger.info("Pushing data to OAA...")
+        logger.info("Pushing data to OAA...")
         
         try:
             response = self.oaa_client.push_application(
@@ -694,18 +1198,18 @@ class SailPointOAAProvider:
             
             if response.get("warnings"):
                 for warning in response["warnings"]:
-                    self.logger.warning(f"Push warning: {warning}")
+                    logger.warning("Push warning: %s", warning)
                     
-            self.logger.info("Sync completed successfully")
+            logger.info("Sync completed successfully")
             
         except OAAClientError as e:
-            self.logger.error(f"Error pushing to OAA: {str(e)}")
+            logger.error("Error pushing to OAA: %s", e)
             if hasattr(e, 'details'):
                 for detail in e.details:
-                    self.logger.error(f"Detail: {detail}")
+                    logger.error("Detail: %s", detail)
             raise
 
-def main():
+def main() -> None:
     """
     Main function to run the SailPoint OAA integration.
     """
@@ -767,7 +1271,7 @@ def main():
         logger.error(str(e))
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
+        logger.error("Unexpected error: %s", e)
         logger.debug("Exception details:", exc_info=True)
         sys.exit(1)
 
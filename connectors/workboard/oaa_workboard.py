@@ -12,13 +12,19 @@ Required environment variables:
     VEZA_API_KEY: Veza API key
 """
 
+from __future__ import annotations
+
+import functools
+import json
 import logging
 import logging.config
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Union
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Any, Iterator, Sequence, Tuple, Union
 from urllib.parse import urljoin
 
 import requests
@@ -26,10 +32,31 @@ from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 from requests.packages.urllib3.util.retry import Retry
 
-from oaaclient.client import OAAClient, OAAClientError
-from oaaclient.templates import CustomApplication, OAAPermission, OAAPropertyType
+# The OAA SDK is imported where it is used so --dry-run starts without it
+if TYPE_CHECKING:
+    from oaaclient.client import OAAClient
+    from oaaclient.templates import CustomApplication
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # type: ignore[assignment]
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None  # type: ignore[assignment]
+    pc = None  # type: ignore[assignment]
 
 # Icon constants
+# Adjacent literals are joined at compile time into one str, which
+# OAAClient.update_provider_icon uploads as-is without decoding it
 WORKBOARD_ICON_B64 = (
     "PHN2ZyB3aWR0aD0iMjUwMCIgaGVpZ2h0PSIyNTAwIiB2aWV3Qm94PSIwIDAgMjU2IDI1NiIgeG1sbnM9"
     "Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIiBwcmVzZXJ2ZUFzcGVjdFJhdGlvPSJ4TWlkWU1pZCI+"
@@ -51,6 +78,16 @@ VEZA_API_KEY = "VEZA_API_KEY"
 # Constants
 DEFAULT_TIMEOUT = 30
 MAX_RETRIES = 3
+POOL_SIZE = 32  # Keep-alive connections kept per host
+MAX_FETCH_WORKERS = 16  # Concurrent requests in fetch_users_bulk
+VECTORIZE_MIN_USERS = 500  # Below this, per-user admin checks are cheaper
+
+# Shared immutable defaults for users without a manager or profile
+_EMPTY_TUPLE: Sequence[Any] = ()
+_EMPTY_MAP: Mapping[str, Any] = MappingProxyType({})
+
+# dataclass(slots=True) is only available on Python 3.10+
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 # Configure logging
 logging.config.dictConfig({
@@ -80,7 +117,7 @@ logging.config.dictConfig({
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class WorkBoardUser:
     """Data class representing a WorkBoard user based on actual API response."""
     user_id: str
@@ -95,8 +132,9 @@ class WorkBoardUser:
     time_zone: Optional[str] = None
     external_id: Optional[str] = None
     org_id: Optional[str] = None
-    manager: List[Dict[str, Any]] = field(default_factory=list)
-    profile: Dict[str, Any] = field(default_factory=dict)
+    manager: Sequence[Dict[str, Any]] = _EMPTY_TUPLE
+    # dataclasses reject mappingproxy defaults, so hand out the shared one
+    profile: Mapping[str, Any] = field(default_factory=lambda: _EMPTY_MAP)
 
     @classmethod
     def from_api_response(cls, data: Dict[str, Any]) -> 'WorkBoardUser':
@@ -117,8 +155,8 @@ class WorkBoardUser:
             time_zone=data.get("time_zone"),
             external_id=data.get("external_id"),
             org_id=data.get("org_id"),
-            manager=data.get("manager", []),
-            profile=data.get("profile", {})
+            manager=data.get("manager") or _EMPTY_TUPLE,
+            profile=data.get("profile") or _EMPTY_MAP
         )
 
     @property
@@ -142,6 +180,72 @@ class WorkBoardUser:
             if "name" in attr and "value" in attr
         }
 
+@functools.lru_cache(maxsize=4096)
+def _format_epoch(ts: int) -> str:
+    """Convert epoch seconds to ISO format."""
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+class WorkBoardUserBatch:
+    """Struct-of-arrays storage for many WorkBoard users, one list per field."""
+    
+    def __init__(self) -> None:
+        self.user_ids: List[str] = []
+        self.emails: List[str] = []
+        self.first_names: List[str] = []
+        self.last_names: List[str] = []
+        self.wb_emails: List[Optional[str]] = []
+        self.cell_nums: List[Optional[str]] = []
+        self.create_ats: List[Optional[int]] = []
+        self.last_visited_ats: List[Optional[str]] = []
+        self.pictures: List[Optional[str]] = []
+        self.time_zones: List[Optional[str]] = []
+        self.external_ids: List[Optional[str]] = []
+        self.org_ids: List[Optional[str]] = []
+        self.managers: List[Sequence[Dict[str, Any]]] = []
+        self.profiles: List[Mapping[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def __getitem__(self, index: int) -> WorkBoardUser:
+        """Materialize the user at `index`."""
+        return WorkBoardUser(
+            user_id=self.user_ids[index],
+            email=self.emails[index],
+            first_name=self.first_names[index],
+            last_name=self.last_names[index],
+            wb_email=self.wb_emails[index],
+            cell_num=self.cell_nums[index],
+            create_at=self.create_ats[index],
+            last_visited_at=self.last_visited_ats[index],
+            picture=self.pictures[index],
+            time_zone=self.time_zones[index],
+            external_id=self.external_ids[index],
+            org_id=self.org_ids[index],
+            manager=self.managers[index],
+            profile=self.profiles[index]
+        )
+
+    def append_from_api_response(self, data: Dict[str, Any]) -> None:
+        """Append a user from API response data."""
+        if not data.get("user_id"):
+            raise ValueError("User must have a user_id")
+        
+        self.user_ids.append(str(data["user_id"]))
+        self.emails.append(data.get("email", ""))
+        self.first_names.append(data.get("first_name", ""))
+        self.last_names.append(data.get("last_name", ""))
+        self.wb_emails.append(data.get("wb_email"))
+        self.cell_nums.append(data.get("cell_num"))
+        self.create_ats.append(data.get("create_at"))
+        self.last_visited_ats.append(data.get("last_visited_at"))
+        self.pictures.append(data.get("picture"))
+        self.time_zones.append(data.get("time_zone"))
+        self.external_ids.append(data.get("external_id"))
+        self.org_ids.append(data.get("org_id"))
+        self.managers.append(data.get("manager") or _EMPTY_TUPLE)
+        self.profiles.append(data.get("profile") or _EMPTY_MAP)
+
 def format_timestamp(ts: Optional[Union[int, str]]) -> Optional[str]:
     """Format timestamp to ISO format."""
     if not ts:
@@ -152,11 +256,60 @@ def format_timestamp(ts: Optional[Union[int, str]]) -> Optional[str]:
             # Convert string timestamp to integer
             ts = int(ts)
         # Convert epoch to ISO
-        return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+        return _format_epoch(ts)
     except (ValueError, TypeError) as e:
         logger.warning(f"Error formatting timestamp {ts}: {e}")
         return None
 
+def admin_flags(titles: Sequence[str], manager_roles: Sequence[str]) -> List[bool]:
+    """
+    Flag users whose title or first manager's role mentions "admin".
+    
+    Uses one pyarrow compute pass when pyarrow is installed and there are
+    more than VECTORIZE_MIN_USERS users, otherwise the same check as process_user.
+    """
+    if pa is None or len(titles) <= VECTORIZE_MIN_USERS:
+        return [
+            "admin" in title.lower() or "admin" in role.lower()
+            for title, role in zip(titles, manager_roles)
+        ]
+        
+    return pc.or_(
+        pc.match_substring(pa.array(titles, pa.string()), "admin", ignore_case=True),
+        pc.match_substring(pa.array(manager_roles, pa.string()), "admin", ignore_case=True)
+    ).to_pylist()
+
+@functools.lru_cache(maxsize=1024)
+def custom_property_name(attr_name: str) -> str:
+    """Get the OAA property name for a WorkBoard custom attribute."""
+    return "custom_" + attr_name.lower().replace(" ", "_")
+
+@functools.lru_cache(maxsize=None)
+def application_schema() -> Tuple[Tuple[Tuple[str, Any], ...], Tuple[Tuple[str, Tuple[Any, ...]], ...]]:
+    """Get the local user properties and custom permissions of the WorkBoard application."""
+    from oaaclient.templates import OAAPermission, OAAPropertyType
+    
+    local_user_properties = (
+        ("workboard_id", OAAPropertyType.STRING),
+        ("email", OAAPropertyType.STRING),
+        ("title", OAAPropertyType.STRING),
+        ("company", OAAPropertyType.STRING),
+        ("manager_id", OAAPropertyType.STRING),
+        ("manager_role", OAAPropertyType.STRING),
+        ("time_zone", OAAPropertyType.STRING),
+        ("external_id", OAAPropertyType.STRING),
+    )
+    
+    # Custom permissions and the canonical permissions they map to
+    custom_permissions = (
+        ("admin", (OAAPermission.DataRead, OAAPermission.DataWrite,
+                   OAAPermission.MetadataRead, OAAPermission.MetadataWrite)),
+        ("user", (OAAPermission.DataRead, OAAPermission.DataWrite)),
+        ("viewer", (OAAPermission.DataRead, OAAPermission.MetadataRead)),
+    )
+    
+    return local_user_properties, custom_permissions
+
 class WorkBoardError(Exception):
     """Base exception for WorkBoard integration errors."""
     pass
@@ -173,6 +326,7 @@ class APIError(WorkBoardError):
         self.status_code = status_code
         self.response = response
 
+@functools.lru_cache(maxsize=None)
 def get_required_env_var(var_name: str) -> str:
     """Get required environment variable or raise error if not set."""
     value = os.getenv(var_name)
@@ -180,14 +334,45 @@ def get_required_env_var(var_name: str) -> str:
         raise ConfigurationError(f"Required environment variable '{var_name}' is not set")
     return value
 
+@dataclass(frozen=True)
+class WorkBoardConfig:
+    """Settings read once from the environment at startup."""
+    workboard_url: str
+    workboard_token: str = field(repr=False)
+    veza_url: str
+    veza_api_key: str = field(repr=False)
+
+    @classmethod
+    def from_env(cls) -> 'WorkBoardConfig':
+        """Build the configuration from the required environment variables."""
+        return cls(
+            workboard_url=get_required_env_var(WORKBOARD_URL),
+            workboard_token=get_required_env_var(WORKBOARD_TOKEN),
+            veza_url=get_required_env_var(VEZA_URL),
+            veza_api_key=get_required_env_var(VEZA_API_KEY)
+        )
+
 class WorkBoardOAAProvider:
     """OAA Provider for WorkBoard integration."""
     
-    def __init__(self, oaa_client: OAAClient):
+    def __init__(self, oaa_client: Optional[OAAClient], config: Optional[WorkBoardConfig] = None):
         """Initialize the WorkBoard OAA Provider."""
-        self.base_url = get_required_env_var(WORKBOARD_URL)
-        self.token = get_required_env_var(WORKBOARD_TOKEN)
+        if config is not None:
+            self.base_url = config.workboard_url
+            self.token = config.workboard_token
+        else:
+            self.base_url = get_required_env_var(WORKBOARD_URL)
+            self.token = get_required_env_var(WORKBOARD_TOKEN)
         self.oaa_client = oaa_client
+        # Resolved once; the API root replaces any path on base_url
+        self._api_base = urljoin(self.base_url, "/wb/apis/")
+        
+        # Custom attribute property names the SDK rejected as invalid
+        self._rejected_user_props: set = set()
+        
+        # Users fetched during the current sync, keyed by requested user ID
+        # ("" for the authenticated user)
+        self._user_cache: Dict[str, WorkBoardUser] = {}
         
         self._setup_session()
         self.logger = logging.getLogger(__name__)
@@ -202,8 +387,17 @@ class WorkBoardOAAProvider:
             status_forcelist=[429, 500, 502, 503, 504]
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Sessions already send keep-alive and gzip/deflate Accept-Encoding
+        # headers; reusing self.session for every request is what lets the
+        # pooled connections amortize the TLS handshake
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=POOL_SIZE,
+            pool_maxsize=POOL_SIZE,
+            pool_block=False
+        )
         self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
         # Set auth header
         self.session.headers.update({
@@ -211,9 +405,17 @@ class WorkBoardOAAProvider:
             'Accept': 'application/json'
         })
 
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make an API request with error handling."""
-        url = urljoin(self.base_url, f"/wb/apis/{endpoint}")
+    @staticmethod
+    def _decode(response: requests.Response) -> Any:
+        """Decode a JSON response body from its bytes, using orjson when it is installed."""
+        if orjson is not None:
+            return orjson.loads(response.content)
+        # json.loads detects UTF-8 itself, skipping response.json()'s charset guessing
+        return json.loads(response.content)
+
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send an API request, raising APIError on transport or HTTP errors."""
+        url = self._api_base + endpoint.lstrip('/')
         
         try:
             response = self.session.request(
@@ -223,12 +425,7 @@ class WorkBoardOAAProvider:
                 **kwargs
             )
             response.raise_for_status()
-            
-            data = response.json()
-            if not data.get("success"):
-                raise APIError(f"API request failed: {data.get('message', 'Unknown error')}")
-                
-            return data
+            return response
             
         except RequestException as e:
             raise APIError(
@@ -237,24 +434,123 @@ class WorkBoardOAAProvider:
                 response=getattr(e, 'response', None)
             )
 
-    def fetch_user(self) -> WorkBoardUser:
-        """Fetch current user data from WorkBoard."""
+    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Make an API request with error handling."""
+        response = self._send(method, endpoint, **kwargs)
+        
         try:
-            response = self._make_request('GET', 'user/')
-            user_data = response.get("data", {}).get("user", {})
-            
-            if not user_data:
-                raise APIError("No user data in response")
+            data = self._decode(response)
+            if not data.get("success"):
+                raise APIError(f"API request failed: {data.get('message', 'Unknown error')}")
                 
-            return WorkBoardUser.from_api_response(user_data)
+            return data
+            
+        except ValueError as e:
+            raise APIError(f"Invalid JSON in API response: {str(e)}")
+
+    @staticmethod
+    def _user_from_response(response: Dict[str, Any]) -> WorkBoardUser:
+        """Build a WorkBoardUser from a user endpoint response."""
+        user_data = response.get("data", {}).get("user", {})
+        
+        if not user_data:
+            raise APIError("No user data in response")
+            
+        return WorkBoardUser.from_api_response(user_data)
+
+    def fetch_user(self, user_id: Optional[str] = None) -> WorkBoardUser:
+        """Fetch a user, or the current user if no ID is given, caching it for this sync."""
+        key = user_id or ""
+        if key in self._user_cache:
+            return self._user_cache[key]
+            
+        try:
+            response = self._make_request('GET', f'user/{key}')
+            user = self._user_from_response(response)
             
         except APIError as e:
             self.logger.error(f"Failed to fetch user: {str(e)}")
             raise
+            
+        self._user_cache[key] = user
+        self._user_cache.setdefault(user.user_id, user)
+        return user
+
+    def fetch_users_by_id(self, user_ids: List[str]) -> List[WorkBoardUser]:
+        """Fetch users by ID, requesting only those not already cached this sync."""
+        missing = [user_id for user_id in dict.fromkeys(user_ids) if user_id not in self._user_cache]
+        responses = self.fetch_users_bulk([f'user/{user_id}' for user_id in missing])
+        for user_id, response in zip(missing, responses):
+            self._user_cache[user_id] = self._user_from_response(response)
+            
+        return [self._user_cache[user_id] for user_id in user_ids]
+
+    def _iter_response(self, endpoint: str, json_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the items of a list endpoint as they are read off the socket.
+        
+        `json_path` is an ijson prefix ending in ".item", e.g. "data.users.item".
+        Without ijson the body is decoded in full and the same path is walked.
+        A response without a true "success" raises APIError; when streaming this
+        is only known once the whole body has been read, after the items.
+        """
+        response = self._send('GET', endpoint, stream=True)
+        
+        with response:
+            if ijson is None:
+                try:
+                    data = self._decode(response)
+                except ValueError as e:
+                    raise APIError(f"Invalid JSON in API response: {str(e)}")
+                if not isinstance(data, dict) or not data.get("success"):
+                    message = data.get('message', 'Unknown error') if isinstance(data, dict) else 'Unknown error'
+                    raise APIError(f"API request failed: {message}")
+                for key in json_path.split(".")[:-1]:
+                    data = data.get(key) if isinstance(data, dict) else None
+                yield from data or []
+                return
+                
+            # Let urllib3 undo any gzip/deflate encoding before parsing
+            response.raw.decode_content = True
+            status: Dict[str, Any] = {}
+            events = self._watch_status(ijson.parse(response.raw, use_float=True), status)
+            try:
+                yield from ijson.items(events, json_path)
+            except ijson.JSONError as e:
+                raise APIError(f"Invalid JSON in API response: {str(e)}")
+            if not status.get("success"):
+                raise APIError(f"API request failed: {status.get('message', 'Unknown error')}")
+
+    @staticmethod
+    def _watch_status(events: Iterator[Tuple[str, str, Any]],
+                      status: Dict[str, Any]) -> Iterator[Tuple[str, str, Any]]:
+        """Pass ijson events through, recording the top-level "success" and "message" values."""
+        for prefix, event, value in events:
+            if prefix in ("success", "message") and event not in ("start_map", "start_array", "end_map", "end_array"):
+                status[prefix] = value
+            yield prefix, event, value
+
+    def fetch_users(self, endpoint: str = 'users/',
+                    json_path: str = 'data.users.item') -> Iterator[WorkBoardUser]:
+        """Stream users from a list endpoint without materializing the full response."""
+        for user_data in self._iter_response(endpoint, json_path):
+            yield WorkBoardUser.from_api_response(user_data)
+
+    def fetch_users_bulk(self, endpoints: List[str]) -> List[Dict[str, Any]]:
+        """Fetch several endpoints concurrently, returning responses in request order."""
+        if not endpoints:
+            return []
+        
+        # 429s are retried by the session's Retry strategy
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(endpoints))) as executor:
+            return list(executor.map(lambda endpoint: self._make_request('GET', endpoint), endpoints))
 
-    def process_user(self, provider_data: CustomApplication, user: WorkBoardUser) -> None:
-        """Process a user and add to provider data."""
+    def process_user(self, provider_data: CustomApplication, user: WorkBoardUser,
+                     is_admin: Optional[bool] = None) -> None:
+        """Process a user and add to provider data, computing the admin flag unless given."""
         try:
+            title = user.get_title()
+            
             # Create/update user
             oaa_user = provider_data.add_local_user(
                 name=user.full_name,
@@ -268,40 +564,40 @@ class WorkBoardOAAProvider:
             oaa_user.is_active = True  # Since we can fetch the user data, they must be active
             
             # Set custom properties
-            oaa_user.set_property("workboard_id", user.user_id)
-            oaa_user.set_property("email", user.email)
-            if title := user.get_title():
-                oaa_user.set_property("title", title)
+            props = {"workboard_id": user.user_id, "email": user.email}
+            if title:
+                props["title"] = title
             if company := user.get_company():
-                oaa_user.set_property("company", company)
+                props["company"] = company
             
             # Process manager relationship
             for manager in user.manager:
                 manager_id = manager.get("user_id")
                 if manager_id:
-                    oaa_user.set_property("manager_id", manager_id)
+                    props["manager_id"] = manager_id
                     # Add manager role information if available
                     manager_role = manager.get("role")
                     if manager_role:
-                        oaa_user.set_property("manager_role", manager_role)
+                        props["manager_role"] = manager_role
                     break
             
-            # Process custom attributes
+            # Process custom attributes, declaring each new name once
             custom_attrs = user.get_custom_attributes()
+            declared = provider_data.property_definitions.local_user_properties
             for attr_name, attr_value in custom_attrs.items():
-                safe_name = attr_name.lower().replace(" ", "_")
-                try:
-                    oaa_user.set_property(f"custom_{safe_name}", attr_value)
-                except Exception as e:
-                    self.logger.warning(f"Failed to set custom attribute {attr_name}: {e}")
+                key = custom_property_name(attr_name)
+                if key in declared or self._declare_user_property(provider_data, key):
+                    props[key] = attr_value
+            
+            # Every name is known to be declared, so the per-name
+            # validation in set_property can be skipped
+            oaa_user.properties.update(props)
             
             # Add role-based permission based on title and role
-            is_admin = any([
-                title and "admin" in title.lower() for title in [
-                    user.get_title(),
-                    manager.get("role", "").lower() if user.manager else None
-                ] if title
-            ])
+            if is_admin is None:
+                is_admin = "admin" in (title or "").lower() or (
+                    bool(user.manager) and "admin" in (user.manager[0].get("role") or "").lower()
+                )
             
             role = "admin" if is_admin else "user"
             oaa_user.add_permission(permission=role, apply_to_application=True)
@@ -310,8 +606,37 @@ class WorkBoardOAAProvider:
             self.logger.error(f"Error processing user {user.user_id}: {str(e)}")
             raise
 
+    def _declare_user_property(self, provider_data: CustomApplication, name: str) -> bool:
+        """Declare a string local user property, returning False if the name is invalid."""
+        from oaaclient.templates import OAAPropertyType
+        
+        if name in self._rejected_user_props:
+            return False
+            
+        try:
+            provider_data.property_definitions.define_local_user_property(name, OAAPropertyType.STRING)
+        except Exception as e:
+            self.logger.warning(f"Skipping custom attribute property {name}: {e}")
+            self._rejected_user_props.add(name)
+            return False
+            
+        return True
+
+    def process_users(self, provider_data: CustomApplication, batch: WorkBoardUserBatch) -> None:
+        """Process every user in a batch and add them to provider data."""
+        titles = [profile.get("title") or "" for profile in batch.profiles]
+        manager_roles = [
+            (managers[0].get("role") if managers else None) or ""
+            for managers in batch.managers
+        ]
+        
+        for index, is_admin in enumerate(admin_flags(titles, manager_roles)):
+            self.process_user(provider_data, batch[index], is_admin=is_admin)
+
     def sync(self) -> None:
         """Sync WorkBoard data to OAA."""
+        self._user_cache.clear()
+        
         try:
             provider_name = "WorkBoard"
             data_source_name = f"WorkBoard - {self.base_url.split('//')[1]}"
@@ -337,137 +662,83 @@ class WorkBoardOAAProvider:
             self.logger.error(f"Sync failed: {str(e)}")
             raise
 
-    def _push_to_oaa(self, provider_name: str, data_source_name: str, provider_data: CustomApplication, save_json: bool = False) -> None:
-            """Push data to OAA with provider setup."""
-            try:
-                # Get or create provider
-                provider = self.oaa_client.get_provider(provider_name)
-                if not provider:
-                    self.logger.info(f"Creating new provider: {provider_name}")
-                    provider = self.oaa_client.create_provider(
-                        name=provider_name,
-                        custom_template="application"
-                    )
-                else:
-                    self.logger.info(f"Found existing provider: {provider_name}")
-
-                # Set the icon and push data
-                try:
-                    self.oaa_client.update_provider_icon(provider['id'], WORKBOARD_ICON_B64)
-                    response = self.oaa_client.push_application(
-                        provider_name, 
-                        data_source_name=data_source_name, 
-                        application_object=provider_data, 
-                        save_json=save_json
-                    )
-                    if response.get("warnings", None):
-                        self.logger.warning("Push succeeded with warnings:")
-                        for e in response["warnings"]:
-                            self.logger.warning(e)
-
-                    self.logger.info("Success")
-
-                except OAAClientError as e:
-                    self.logger.error(f"Veza API error {e.error}: {e.message} ({e.status_code})")
-                    if hasattr(e, "details"):
-                        for d in e.details:
-                            self.logger.error(d)
-                    self.logger.error("Update did not finish")
-                    raise e
-
-            except Exception as e:
-                self.logger.error(f"Error during provider setup/push: {str(e)}")
-                raise
-
-    def _create_provider_data(self) -> CustomApplication:
-            """Create and configure the provider data structure."""
-            provider_data = CustomApplication(
-                name="WorkBoard",
-                application_type="Collaboration",
-                description="WorkBoard OKR and Strategy Execution Platform"
-            )
-            
-            # Define custom properties
-            provider_data.property_definitions.define_local_user_property(
-                "workboard_id", 
-                OAAPropertyType.STRING
-            )
-            provider_data.property_definitions.define_local_user_property(
-                "email", 
-                OAAPropertyType.STRING
-            )
-            provider_data.property_definitions.define_local_user_property(
-                "title", 
-                OAAPropertyType.STRING
-            )
-            provider_data.property_definitions.define_local_user_property(
-                "company", 
-                OAAPropertyType.STRING
-            )
-            provider_data.property_definitions.define_local_user_property(
-                "manager_id", 
-                OAAPropertyType.STRING
-            )
-            provider_data.property_definitions.define_local_user_property(
-                "manager_role", 
-                OAAPropertyType.STRING
-            )
-            provider_data.property_definitions.define_local_user_property(
-                "time_zone", 
-                OAAPropertyType.STRING
-            )
-            provider_data.property_definitions.define_local_user_property(
-                "external_id", 
-                OAAPropertyType.STRING
-            )
-            
-            # Define permissions
-            provider_data.add_custom_permission(
-                "admin",
-                [OAAPermission.DataRead, OAAPermission.DataWrite, 
-                OAAPermission.MetadataRead, OAAPermission.MetadataWrite]
-            )
-            provider_data.add_custom_permission(
-                "user",
-                [OAAPermission.DataRead, OAAPermission.DataWrite]
-            )
-            provider_data.add_custom_permission(
-                "viewer",
-                [OAAPermission.DataRead, OAAPermission.MetadataRead]
-            )
-            
-            return provider_data
-
     def _push_to_oaa(
         self,
         provider_name: str,
         data_source_name: str,
-        provider_data: CustomApplication
+        provider_data: CustomApplication,
+        save_json: bool = False,
+        create_provider: bool = True
     ) -> None:
-        """Push provider data to OAA."""
-        self.logger.info("Pushing data to OAA...")
+        """Push data to OAA, creating the provider first if needed and allowed."""
+        from oaaclient.client import OAAClientError
         
-        try:
-            response = self.oaa_client.push_application(
-                provider_name=provider_name,
-                data_source_name=data_source_name,
-                application_object=provider_data,
-                create_provider=True
-            )
-            
-            if response.get("warnings"):
-                for warning in response["warnings"]:
-                    self.logger.warning(f"Push warning: {warning}")
-                    
-            self.logger.info("Sync completed successfully")
+        if self.oaa_client is None:
+            raise ConfigurationError("An OAA client is required to push data")
             
-        except OAAClientError as e:
-            self.logger.error(f"Error pushing to OAA: {str(e)}")
-            if hasattr(e, 'details'):
-                for detail in e.details:
-                    self.logger.error(f"Detail: {detail}")
+        try:
+            # Get or create provider
+            provider = self.oaa_client.get_provider(provider_name)
+            if not provider:
+                if not create_provider:
+                    raise WorkBoardError(f"Provider {provider_name} does not exist")
+                self.logger.info(f"Creating new provider: {provider_name}")
+                provider = self.oaa_client.create_provider(
+                    name=provider_name,
+                    custom_template="application"
+                )
+            else:
+                self.logger.info(f"Found existing provider: {provider_name}")
+
+            # Set the icon and push data
+            try:
+                self.oaa_client.update_provider_icon(provider['id'], WORKBOARD_ICON_B64)
+                response = self.oaa_client.push_application(
+                    provider_name, 
+                    data_source_name=data_source_name, 
+                    application_object=provider_data, 
+                    save_json=save_json
+                )
+                if response.get("warnings", None):
+                    self.logger.warning("Push succeeded with warnings:")
+                    for e in response["warnings"]:
+                        self.logger.warning(e)
+
+                self.logger.info("Success")
+
+            except OAAClientError as e:
+                self.logger.error(f"Veza API error {e.error}: {e.message} ({e.status_code})")
+                if hasattr(e, "details"):
+                    for d in e.details:
+                        self.logger.error(d)
+                self.logger.error("Update did not finish")
+                raise e
+
+        except Exception as e:
+            self.logger.error(f"Error during provider setup/push: {str(e)}")
             raise
 
+    def _create_provider_data(self) -> CustomApplication:
+        """Create and configure the provider data structure."""
+        from oaaclient.templates import CustomApplication
+        
+        local_user_properties, custom_permissions = application_schema()
+        provider_data = CustomApplication(
+            name="WorkBoard",
+            application_type="Collaboration",
+            description="WorkBoard OKR and Strategy Execution Platform"
+        )
+        
+        # Define custom properties
+        for name, property_type in local_user_properties:
+            provider_data.property_definitions.define_local_user_property(name, property_type)
+            
+        # Define permissions
+        for name, permissions in custom_permissions:
+            provider_data.add_custom_permission(name, list(permissions))
+        
+        return provider_data
+
 def main():
     """Main function to run the WorkBoard OAA integration."""
     import argparse
@@ -496,24 +767,14 @@ def main():
     
     try:
         # Get configurations
-        veza_url = get_required_env_var(VEZA_URL)
-        veza_api_key = get_required_env_var(VEZA_API_KEY)
-        
-        # Initialize OAA client
-        oaa_client = OAAClient(
-            url=veza_url,
-            api_key=veza_api_key
-        )
-        
-        # Initialize and run provider
-        provider = WorkBoardOAAProvider(oaa_client=oaa_client)
+        config = WorkBoardConfig.from_env()
         
         if args.dry_run:
-            # Just fetch and display user data
+            # Just fetch and display user data; no OAA client is needed
+            provider = WorkBoardOAAProvider(oaa_client=None, config=config)
             user = provider.fetch_user()
             logger.info(f"Successfully fetched user data for: {user.full_name}")
             if args.save_json:
-                import json
                 with open('workboard_user.json', 'w') as f:
                     json.dump({
                         'user_id': user.user_id,
@@ -521,15 +782,28 @@ def main():
                         'email': user.email,
                         'title': user.get_title(),
                         'company': user.get_company(),
-                        'manager': user.manager,
-                        'profile': user.profile
+                        'manager': list(user.manager),
+                        'profile': dict(user.profile)
                     }, f, indent=2)
                 logger.info("Saved user data to workboard_user.json")
         else:
-            # Perform full sync
-            provider.sync()
+            from oaaclient.client import OAAClient, OAAClientError
+            
+            try:
+                # Initialize OAA client
+                oaa_client = OAAClient(
+                    url=config.veza_url,
+                    api_key=config.veza_api_key
+                )
+                
+                # Initialize provider and perform full sync
+                provider = WorkBoardOAAProvider(oaa_client=oaa_client, config=config)
+                provider.sync()
+            except OAAClientError as e:
+                logger.error(str(e))
+                sys.exit(1)
         
-    except (ConfigurationError, APIError, OAAClientError) as e:
+    except (ConfigurationError, APIError) as e:
         logger.error(str(e))
         sys.exit(1)
     except Exception as e:
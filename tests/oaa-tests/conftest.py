@@ -0,0 +1,71 @@
+"""Fixtures that load the connector scripts under test and build their providers."""
+import importlib.util
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+WORKBOARD = ROOT / "connectors" / "workboard" / "oaa_workboard.py"
+SAILPOINT = ROOT / "connectors" / "sailpoint-identitynow" / "oaa_sailpoint-identitynow.py"
+SAILPOINT_USERS = ROOT / "tests" / "sailpoint_users.py"
+
+
+def load_script(name, path):
+    """Load a script as a module without running it, replacing any earlier load."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def workboard():
+    """The WorkBoard connector module."""
+    pytest.importorskip("oaaclient")
+    pytest.importorskip("requests")
+    return load_script("oaa_workboard", WORKBOARD)
+
+
+@pytest.fixture
+def workboard_provider(workboard):
+    """A WorkBoard provider that never talks to WorkBoard or Veza."""
+    config = workboard.WorkBoardConfig(
+        workboard_url="https://www.myworkboard.com",
+        workboard_token="token",
+        veza_url="https://veza.example.com",
+        veza_api_key="key"
+    )
+    return workboard.WorkBoardOAAProvider(oaa_client=None, config=config)
+
+
+@pytest.fixture
+def sailpoint():
+    """The SailPoint connector module."""
+    for name in ("oaaclient", "msgspec", "tenacity", "requests"):
+        pytest.importorskip(name)
+    return load_script("oaa_sailpoint_identitynow", SAILPOINT)
+
+
+@pytest.fixture
+def sailpoint_credentials(monkeypatch):
+    """Set the SailPoint environment variables the provider and export script require."""
+    monkeypatch.setenv("SAILPOINT_TENANT", "acme")
+    monkeypatch.setenv("SAILPOINT_CLIENT_ID", "client")
+    monkeypatch.setenv("SAILPOINT_CLIENT_SECRET", "secret")
+
+
+@pytest.fixture
+def sailpoint_provider(sailpoint, sailpoint_credentials):
+    """A SailPoint provider that never talks to Veza and is not rate limited."""
+    provider = sailpoint.SailPointOAAProvider(oaa_client=None)
+    provider._rate_limiter = sailpoint.RateLimiter(1e6, 1000)
+    return provider
+
+
+@pytest.fixture
+def sailpoint_users():
+    """The sailpoint_users.py export script."""
+    pytest.importorskip("aiohttp")
+    return load_script("sailpoint_users", SAILPOINT_USERS)
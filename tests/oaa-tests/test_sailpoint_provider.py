@@ -0,0 +1,161 @@
+"""Checks of the SailPoint connector's provider against a fake SailPoint API."""
+import json
+import threading
+import time
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+PAGE_SIZE = 250
+PAGES = 40
+
+
+class FakeSession:
+    """Serves numbered pages, answering earlier pages more slowly than later ones."""
+
+    def __init__(self):
+        self.requests = []
+        self.consumed_page = 0  # page of the last item the caller received
+        self.ahead = []  # pages each request was ahead of the caller
+        self._lock = threading.Lock()
+
+    def request(self, method, url, timeout=None, params=None, **kwargs):
+        page = params["offset"] // PAGE_SIZE
+        with self._lock:
+            self.requests.append(dict(params))
+            self.ahead.append(page - self.consumed_page)
+        if page:
+            time.sleep(0.002 * (PAGES - page) / PAGES)
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = json.dumps(
+            [{"id": f"{page}-{i}", "page": page} for i in range(PAGE_SIZE)]
+        ).encode()
+        if params.get("count") == "true":
+            response.headers["X-Total-Count"] = str(PAGES * PAGE_SIZE)
+        return response
+
+
+def test_pages_are_returned_in_order(sailpoint_provider):
+    session = FakeSession()
+    sailpoint_provider.session = session
+
+    ids = []
+    for item in sailpoint_provider.get_paginated_results("public-identities", {"limit": PAGE_SIZE}):
+        session.consumed_page = item["page"]
+        ids.append(item["id"])
+
+    assert ids == [f"{page}-{i}" for page in range(PAGES) for i in range(PAGE_SIZE)]
+    assert sorted(r["offset"] for r in session.requests) == list(range(0, PAGES * PAGE_SIZE, PAGE_SIZE))
+
+
+def test_count_is_only_requested_on_the_first_page(sailpoint_provider):
+    session = FakeSession()
+    sailpoint_provider.session = session
+
+    list(sailpoint_provider.get_paginated_results("public-identities", {"limit": PAGE_SIZE}))
+
+    assert session.requests[0] == {"limit": PAGE_SIZE, "offset": 0, "count": "true"}
+    assert all("count" not in r for r in session.requests[1:])
+
+
+def test_pages_in_flight_are_bounded(sailpoint, sailpoint_provider):
+    session = FakeSession()
+    sailpoint_provider.session = session
+
+    for item in sailpoint_provider.get_paginated_results("public-identities", {"limit": PAGE_SIZE}):
+        session.consumed_page = item["page"]
+        # A slow consumer lets the fetchers get as far ahead as they are allowed to
+        if item["id"].endswith("-0"):
+            time.sleep(0.001)
+
+    # The next page is requested just before the page after the caller's is handed
+    # back, so it is at most one further ahead than the MAX_INFLIGHT_PAGES pending
+    assert max(session.ahead) <= sailpoint.MAX_INFLIGHT_PAGES + 1
+    assert max(session.ahead) > 1
+
+
+def test_user_groups_refer_to_local_groups(sailpoint, sailpoint_provider):
+    app = sailpoint_provider._create_provider_data()
+    sailpoint_provider.process_identities_batch(app, [
+        sailpoint.RawIdentity(id="u1", name="Ann", groups=[{"id": "gid", "name": "g"}]),
+        sailpoint.RawIdentity(id="u2", name="Bo", groups=[{"id": "gid", "name": "g"}, {"name": "no-id"}])
+    ])
+
+    payload = app.get_payload()
+    group_ids = {group["id"] for group in payload["applications"][0]["local_groups"]}
+    assert group_ids == {"gid", "no-id"}
+    for user in payload["applications"][0]["local_users"]:
+        assert user["groups"] and set(user["groups"]) <= group_ids
+
+
+
+def test_groups_differing_only_in_case_are_one_group(sailpoint, sailpoint_provider, caplog):
+    app = sailpoint_provider._create_provider_data()
+    sailpoint_provider.process_identities_batch(app, [
+        sailpoint.RawIdentity(id="u1", name="Ann", groups=[{"id": "GID", "name": "Admins"}, {"name": "Ops"}]),
+        sailpoint.RawIdentity(id="u2", name="Bo", groups=[{"id": "gid", "name": "admins"}, {"name": "ops"}]),
+        sailpoint.RawIdentity(id="u3", name="Cy", groups=[{"id": "GID", "name": "Admins"}, {"id": "gid", "name": "admins"}])
+    ])
+
+    # The SDK's local_groups ignores case, so a second add_local_group would have failed
+    assert "Error adding user" not in caplog.text
+    payload = app.get_payload()
+    assert {group["id"] for group in payload["applications"][0]["local_groups"]} == {"GID", "Ops"}
+    memberships = {user["id"]: user["groups"] for user in payload["applications"][0]["local_users"]}
+    assert memberships == {"u1": ["GID", "Ops"], "u2": ["GID", "Ops"], "u3": ["GID"]}
+
+class FakeClock:
+    """Monotonic clock that only moves when the rate limiter sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter_halves_on_throttle_and_recovers(sailpoint):
+    clock = FakeClock()
+    limiter = sailpoint.RateLimiter(10.0, 1, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(0.1)]
+
+    limiter.throttled()
+    assert limiter.rate == 5.0
+    limiter.acquire()
+    assert clock.sleeps[-1] == pytest.approx(0.2)
+
+    limiter.throttled()
+    limiter.throttled()
+    assert limiter.rate == 1.25
+
+    # The rate is raised by one step per RATE_RECOVERY_SUCCESSES successes, up to the maximum
+    for _ in range(sailpoint.RATE_RECOVERY_SUCCESSES - 1):
+        limiter.succeeded()
+    assert limiter.rate == 1.25
+    limiter.succeeded()
+    assert limiter.rate == 1.25 + sailpoint.RATE_RECOVERY_STEP
+    for _ in range(20 * sailpoint.RATE_RECOVERY_SUCCESSES):
+        limiter.succeeded()
+    assert limiter.rate == 10.0
+
+    for _ in range(10):
+        limiter.throttled()
+    assert limiter.rate == sailpoint.MIN_REQUESTS_PER_SECOND
+
+
+def test_rate_limit_is_a_deprecated_alias(sailpoint, sailpoint_credentials):
+    with pytest.warns(DeprecationWarning):
+        provider = sailpoint.SailPointOAAProvider(oaa_client=None, rate_limit=0.5)
+    assert provider._rate_limiter.rate == 2.0
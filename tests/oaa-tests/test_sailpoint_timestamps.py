@@ -0,0 +1,41 @@
+"""Check that the vectorized format_timestamps matches format_timestamp value by value."""
+import pytest
+
+pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("ts", [
+    # Milliseconds, with and without a fraction of a second
+    1700000000000,
+    1700000000123,
+    1700000000001,
+    1700000000999,
+    -1,
+    2 ** 32 * 1000 - 1,
+    -2 ** 32 * 1000 + 1,
+    2 ** 33 * 1000 + 123,
+    253402300799999,
+    -62135596800000,
+    253402300800000,
+    10 ** 17,
+    1700000000123.5,
+    True,
+    # ISO strings
+    "2024-01-01T00:00:00Z",
+    "2024-01-01T00:00:00.123Z",
+    "2024-01-01T00:00:00+05:30",
+    "2024-01-01T00:00:00.123456-08:00",
+    "2024-01-01",
+    # Empty and malformed
+    None,
+    0,
+    "",
+    "not a date",
+    "2024-13-01",
+])
+def test_format_timestamps_matches_format_timestamp(sailpoint, ts):
+    # Enough integer timestamps around the value to take the vectorized path
+    padding = [1700000000000 + i for i in range(sailpoint.VECTORIZE_MIN_TIMESTAMPS)]
+    values = [ts] + padding + [ts]
+
+    assert sailpoint.format_timestamps(values) == [sailpoint.format_timestamp(v) for v in values]
@@ -0,0 +1,310 @@
+"""Checks of sailpoint_users.py: page fetching, and token refresh against a fake SailPoint API."""
+import asyncio
+import contextlib
+import csv
+import json
+import sys
+import threading
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+web = pytest.importorskip("aiohttp.web")
+test_utils = pytest.importorskip("aiohttp.test_utils")
+
+PAGE_SIZE = 250
+PAGES = 40
+WINDOW = 4
+CONCURRENT_PAGES = 10
+
+
+def test_slow_first_page_holds_a_bounded_number_of_pages(sailpoint_users):
+    offsets = range(0, PAGES * PAGE_SIZE, PAGE_SIZE)
+    started = []
+    written = []
+    held = []  # pages requested but not yet written, sampled at every request
+
+    async def fetch(offset):
+        started.append(offset)
+        held.append(len(started) - len(written))
+        # The first page is answered long after all the others could have been
+        await asyncio.sleep(0.2 if offset == 0 else 0)
+        return [offset]
+
+    async def put(page):
+        written.append(page[0])
+
+    last = asyncio.run(sailpoint_users.fetch_pages(fetch, offsets, WINDOW, put))
+
+    assert written == list(offsets)
+    assert last == (offsets[-1], [offsets[-1]])
+    assert max(held) == WINDOW
+
+
+def test_no_offsets(sailpoint_users):
+    async def fetch(offset):
+        raise AssertionError("nothing to fetch")
+
+    async def put(page):
+        raise AssertionError("nothing to put")
+
+    assert asyncio.run(sailpoint_users.fetch_pages(fetch, [], WINDOW, put)) is None
+
+
+class FakeSailPoint:
+    """Issues numbered tokens and serves one account per page to accepted tokens."""
+
+    def __init__(self):
+        self.tokens_issued = 0
+        self.page_tokens = []  # token sent with each page request
+        self.rejected = set()  # tokens the API answers with reject_status
+        self.reject_all = False
+        self.reject_status = 401
+
+    async def token(self, request):
+        self.tokens_issued += 1
+        # Slow enough that concurrent callers all wait on the same refresh
+        await asyncio.sleep(0.05)
+        return web.json_response({"access_token": f"t{self.tokens_issued}", "expires_in": 3600})
+
+    async def accounts(self, request):
+        token = request.headers["Authorization"].split()[1]
+        self.page_tokens.append(token)
+        if self.reject_all or token in self.rejected:
+            return web.Response(status=self.reject_status)
+        return web.json_response([{"id": request.query["offset"]}])
+
+
+@contextlib.asynccontextmanager
+async def connect(sailpoint_users, api):
+    """Open a SailPointClient against a local server backed by api."""
+    app = web.Application()
+    app.router.add_post("/oauth/token", api.token)
+    app.router.add_get("/v3/accounts", api.accounts)
+    async with test_utils.TestServer(app) as server:
+        config = sailpoint_users.SailPointConfig(tenant="acme", client_id="client", client_secret="secret")
+        client = sailpoint_users.SailPointClient(config, concurrency=CONCURRENT_PAGES)
+        client._token_url = str(server.make_url("/oauth/token"))
+        client._accounts_url = str(server.make_url("/v3/accounts"))
+        client.prepare_query(limit=1)
+        async with client:
+            yield client
+
+
+async def get_pages(client):
+    return await asyncio.gather(*(client.get_page(offset) for offset in range(CONCURRENT_PAGES)))
+
+
+def test_expired_token_is_refreshed_once_for_concurrent_pages(sailpoint_users):
+    api = FakeSailPoint()
+
+    async def run():
+        async with connect(sailpoint_users, api) as client:
+            client.token_expiry = 0.0
+            return await get_pages(client)
+
+    pages = asyncio.run(run())
+
+    assert [page["items"] for page in pages] == [[{"id": str(offset)}] for offset in range(CONCURRENT_PAGES)]
+    assert api.tokens_issued == 2
+    assert api.page_tokens == ["t2"] * CONCURRENT_PAGES
+
+
+@pytest.mark.parametrize("status", [401, 403])
+def test_rejected_token_is_refreshed_once_for_concurrent_pages(sailpoint_users, status):
+    api = FakeSailPoint()
+    api.rejected.add("t1")
+    api.reject_status = status
+
+    async def run():
+        async with connect(sailpoint_users, api) as client:
+            return await get_pages(client)
+
+    pages = asyncio.run(run())
+
+    assert all(page["items"] for page in pages)
+    assert api.tokens_issued == 2
+    assert sorted(api.page_tokens) == ["t1"] * CONCURRENT_PAGES + ["t2"] * CONCURRENT_PAGES
+
+
+@pytest.mark.parametrize("status", [401, 403])
+def test_token_rejected_after_refresh_fails_without_retrying_again(sailpoint_users, status):
+    api = FakeSailPoint()
+    api.reject_all = True
+    api.reject_status = status
+
+    async def run():
+        async with connect(sailpoint_users, api) as client:
+            await client.get_page(0)
+
+    with pytest.raises(aiohttp.ClientResponseError) as error:
+        asyncio.run(run())
+
+    assert error.value.status == status
+    assert api.tokens_issued == 2
+    assert api.page_tokens == ["t1", "t2"]
+
+
+def test_other_errors_do_not_refresh_the_token(sailpoint_users):
+    api = FakeSailPoint()
+    api.reject_all = True
+    api.reject_status = 500
+
+    async def run():
+        async with connect(sailpoint_users, api) as client:
+            await client.get_page(0)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(run())
+
+    assert api.tokens_issued == 1
+    assert api.page_tokens == ["t1"]
+
+
+class RecordingWriter:
+    """Records written pages; writing the page `block_on` waits for `gate`, and `fail_on` raises."""
+
+    def __init__(self, block_on=None, fail_on=None):
+        self.written = []
+        self.gate = threading.Event()
+        self.block_on = block_on
+        self.fail_on = fail_on
+
+    def write(self, accounts):
+        if accounts == self.block_on:
+            self.gate.wait(5)
+        if accounts == self.fail_on:
+            raise OSError("disk full")
+        self.written.append(accounts)
+
+
+def test_write_queue_writes_every_page_in_order(sailpoint_users):
+    writer = RecordingWriter()
+
+    async def run():
+        async with sailpoint_users.WriteQueue(writer, maxsize=2) as pages:
+            for page in range(PAGES):
+                await pages.put([page])
+        return pages.count
+
+    assert asyncio.run(run()) == PAGES
+    assert writer.written == [[page] for page in range(PAGES)]
+
+
+def test_write_error_is_raised_by_put(sailpoint_users):
+    writer = RecordingWriter(fail_on=[0])
+    queued = []
+
+    async def run():
+        async with sailpoint_users.WriteQueue(writer, maxsize=1) as pages:
+            for page in range(PAGES):
+                await pages.put([page])
+                queued.append(page)
+
+    with pytest.raises(OSError, match="disk full"):
+        asyncio.run(run())
+
+    # put() stops the export once the queue is full behind the failed writer
+    assert len(queued) < PAGES
+    assert writer.written == []
+
+
+@pytest.mark.parametrize("fail_on", [None, [0]])
+def test_export_error_drops_queued_pages_after_the_write_in_progress(sailpoint_users, fail_on):
+    writer = RecordingWriter(block_on=[0], fail_on=fail_on)
+    state = {}
+
+    async def run():
+        async with sailpoint_users.WriteQueue(writer, maxsize=4) as pages:
+            state["pages"] = pages
+            await pages.put([0])
+            # Let the worker start writing the first page, then queue more behind it
+            await asyncio.sleep(0.01)
+            await pages.put([1])
+            await pages.put([2])
+            threading.Timer(0.05, writer.gate.set).start()
+            raise RuntimeError("export failed")
+
+    # The export error takes precedence over a write error
+    with pytest.raises(RuntimeError, match="export failed"):
+        asyncio.run(run())
+
+    # Leaving waited for the write in progress, and the queued pages were not written
+    assert state["pages"]._task.done()
+    assert writer.written == ([] if fail_on else [[0]])
+
+
+ACCOUNTS = [
+    {"id": "a1", "name": "Ann", "disabled": False, "attributes": {"groups": ["x", "y"], "empty": []}},
+    {"id": "a2", "name": "Zoë \"Z\"\nLee", "created": "2024-01-01T00:00:00Z", "manuallyCorrelated": True},
+    {},
+    {"id": "a4", "nativeIdentity": 4, "sourceId": None, "score": 1.5},
+]
+PAGED_ACCOUNTS = [ACCOUNTS[:2], [], ACCOUNTS[2:]]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """The export script, loaded so the JSON writer encodes with orjson or with json."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        # The encoder is chosen when the class is defined, so hide orjson before loading
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    module = request.getfixturevalue("sailpoint_users")
+    assert (module.orjson is not None) == (request.param == "orjson")
+    return module
+
+
+def write_pages(writer_class, filename, pages):
+    with writer_class(str(filename)) as writer:
+        for page in pages:
+            writer.write(writer.prepare(page))
+    return writer
+
+
+def test_json_export_matches_dumping_all_accounts(encoder, tmp_path):
+    path = tmp_path / "accounts.json"
+    writer = write_pages(encoder.JSONAccountWriter, path, PAGED_ACCOUNTS)
+
+    if encoder.orjson is not None:
+        import orjson
+        expected = orjson.dumps(ACCOUNTS, option=orjson.OPT_INDENT_2)
+    else:
+        expected = json.dumps(ACCOUNTS, indent=2).encode()
+    assert path.read_bytes() == expected
+    assert writer.count == len(ACCOUNTS)
+
+
+def test_csv_export_writes_the_exported_fields(sailpoint_users, tmp_path):
+    path = tmp_path / "accounts.csv"
+    write_pages(sailpoint_users.CSVAccountWriter, path, PAGED_ACCOUNTS)
+
+    with path.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(sailpoint_users.CSV_FIELDNAMES)
+    expected = [
+        ["" if account.get(field) is None else str(account[field]) for field in sailpoint_users.CSV_FIELDNAMES]
+        for account in ACCOUNTS
+    ]
+    assert rows[1:] == expected
+
+
+@pytest.mark.parametrize("writer_name", ["JSONAccountWriter", "CSVAccountWriter"])
+def test_no_accounts_creates_no_file(sailpoint_users, tmp_path, writer_name):
+    path = tmp_path / "accounts"
+    writer = write_pages(getattr(sailpoint_users, writer_name), path, [[], []])
+
+    assert writer.count == 0
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("writer_name", ["JSONAccountWriter", "CSVAccountWriter"])
+def test_failed_export_removes_the_file(sailpoint_users, tmp_path, writer_name):
+    path = tmp_path / "accounts"
+    with pytest.raises(RuntimeError):
+        with getattr(sailpoint_users, writer_name)(str(path)) as writer:
+            writer.write(writer.prepare(ACCOUNTS))
+            raise RuntimeError("export failed")
+
+    assert not path.exists()
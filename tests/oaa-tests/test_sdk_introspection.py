@@ -0,0 +1,43 @@
+"""
+Checks of the oaaclient template API the connectors rely on.
+
+Replaces the pytest2/4/6/8.py print scripts. The SDK is imported once for
+the whole module. Set RUN_SDK_INTROSPECTION=1 to run these checks.
+"""
+import inspect
+import os
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("RUN_SDK_INTROSPECTION"),
+    reason="set RUN_SDK_INTROSPECTION=1 to check the oaaclient API"
+)
+
+templates = pytest.importorskip("oaaclient.templates")
+
+
+def test_custom_application_signature():
+    params = inspect.signature(templates.CustomApplication.__init__).parameters
+    assert {"name", "application_type", "description"} <= set(params)
+
+    # A name alone is not enough to build an application
+    with pytest.raises(TypeError):
+        templates.CustomApplication(name="test-app")
+
+    app = templates.CustomApplication(name="test-app", application_type="SAAS")
+    assert app.name == "test-app"
+
+
+@pytest.mark.parametrize("method", ["add_user", "add_group", "add_app", "get_payload"])
+def test_idp_provider_methods(method):
+    params = inspect.signature(templates.CustomIdPProvider.__init__).parameters
+    assert {"name", "idp_type", "domain"} <= set(params)
+
+    provider = templates.CustomIdPProvider(name="test", idp_type="SAAS", domain="test.com")
+    assert callable(getattr(provider, method))
+
+
+@pytest.mark.parametrize("name", ["CustomPermission", "OAAPermission"])
+def test_permission_classes(name):
+    assert name in dir(templates)
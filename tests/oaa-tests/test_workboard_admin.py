@@ -0,0 +1,39 @@
+"""Check that WorkBoard admin detection agrees with and without pyarrow."""
+import pytest
+
+TITLES = [
+    "Admin",
+    "SYSADMIN",
+    "Administrator",
+    "Ad min",
+    "adm",
+    "Engineer",
+    "",
+    "Dév Admin",
+    "ADMİN",
+    "ＡＤＭＩＮ",
+    "Kadmin",
+]
+
+
+@pytest.fixture(params=["pyarrow", "python"])
+def admin_flags(request, workboard, monkeypatch):
+    """admin_flags, forced onto the pyarrow or the pure Python path."""
+    if request.param == "pyarrow":
+        if workboard.pa is None:
+            pytest.skip("pyarrow is not installed")
+    else:
+        monkeypatch.setattr(workboard, "pa", None)
+    return workboard.admin_flags
+
+
+@pytest.mark.parametrize("text", TITLES)
+def test_admin_flags_match_process_user_check(workboard, admin_flags, text):
+    # Enough users around the value to take the pyarrow path when it is installed
+    padding = ["Engineer"] * workboard.VECTORIZE_MIN_USERS
+    titles = [text] + padding + [""]
+    manager_roles = [""] + padding + [text]
+
+    expected = "admin" in text.lower()
+    flags = admin_flags(titles, manager_roles)
+    assert flags == [expected] + [False] * len(padding) + [expected]
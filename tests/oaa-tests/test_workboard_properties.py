@@ -0,0 +1,70 @@
+"""Check that WorkBoard user properties produce the same OAA payload as set_property."""
+
+
+def test_bulk_properties_match_set_property(workboard, workboard_provider):
+    user = workboard.WorkBoardUser.from_api_response({
+        "user_id": 42,
+        "email": "ann@example.com",
+        "first_name": "Ann",
+        "last_name": "Lee",
+        "create_at": 1600000000,
+        "manager": [{"user_id": 7, "role": "Team Lead"}],
+        "profile": {"title": "Engineer", "company": "Acme"}
+    })
+
+    bulk = workboard_provider._create_provider_data()
+    workboard_provider.process_user(bulk, user)
+
+    expected = workboard_provider._create_provider_data()
+    workboard_provider.process_user(expected, user)
+    oaa_user = expected.local_users["42"]
+    oaa_user.properties.clear()
+    oaa_user.set_property("workboard_id", "42")
+    oaa_user.set_property("email", "ann@example.com")
+    oaa_user.set_property("title", "Engineer")
+    oaa_user.set_property("company", "Acme")
+    oaa_user.set_property("manager_id", 7)
+    oaa_user.set_property("manager_role", "Team Lead")
+
+    assert bulk.local_users["42"].to_dict() == oaa_user.to_dict()
+    assert bulk.get_payload() == expected.get_payload()
+
+
+def test_custom_attributes_are_declared_once(workboard, workboard_provider):
+    app = workboard_provider._create_provider_data()
+    for user_id in (1, 2):
+        workboard_provider.process_user(app, workboard.WorkBoardUser.from_api_response({
+            "user_id": user_id,
+            "email": f"user{user_id}@example.com",
+            "first_name": "User",
+            "last_name": str(user_id),
+            "profile": {"custom_attributes": [
+                {"name": "Cost Center", "value": "CC1"},
+                {"name": "Cost-Center", "value": "CC2"}
+            ]}
+        }))
+
+    definitions = app.property_definitions.local_user_properties
+    assert "custom_cost_center" in definitions
+    assert "custom_cost-center" not in definitions
+    assert app.local_users["1"].properties["custom_cost_center"] == "CC1"
+    assert "custom_cost-center" not in app.local_users["2"].properties
+
+
+def test_custom_attributes_are_declared_on_each_application(workboard, workboard_provider):
+    user = workboard.WorkBoardUser.from_api_response({
+        "user_id": 1,
+        "email": "ann@example.com",
+        "first_name": "Ann",
+        "last_name": "Lee",
+        "profile": {"custom_attributes": [{"name": "Cost Center", "value": "CC1"}]}
+    })
+
+    first = workboard_provider._create_provider_data()
+    second = workboard_provider._create_provider_data()
+    workboard_provider.process_user(second, user)
+    workboard_provider.process_user(first, user)
+
+    for app in (first, second):
+        assert "custom_cost_center" in app.property_definitions.local_user_properties
+        assert app.local_users["1"].properties["custom_cost_center"] == "CC1"
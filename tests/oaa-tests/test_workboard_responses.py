@@ -0,0 +1,72 @@
+"""Check that WorkBoard list responses are read the same way with and without ijson."""
+import io
+import json
+
+import pytest
+
+requests = pytest.importorskip("requests")
+urllib3 = pytest.importorskip("urllib3")
+
+USERS = [{"user_id": 1, "email": "ann@example.com"}, {"user_id": 2, "email": "bo@example.com"}]
+
+
+class FakeSession:
+    """Answers every request with the same streamed JSON body."""
+
+    def __init__(self, body):
+        self.body = body
+
+    def request(self, method, url, timeout=None, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.raw = urllib3.HTTPResponse(body=io.BytesIO(self.body), preload_content=False)
+        return response
+
+
+@pytest.fixture
+def serve(workboard_provider):
+    """Make the provider's session answer every request with the given body."""
+    def serve(body):
+        workboard_provider.session = FakeSession(body)
+        return workboard_provider
+    return serve
+
+
+@pytest.fixture(params=["ijson", "stdlib"])
+def workboard(request, workboard, monkeypatch):
+    """The connector, reading responses with ijson or with the stdlib fallback."""
+    if request.param == "ijson":
+        if workboard.ijson is None:
+            pytest.skip("ijson is not installed")
+    else:
+        monkeypatch.setattr(workboard, "ijson", None)
+    return workboard
+
+
+def test_users_are_read(serve):
+    body = json.dumps({"success": True, "data": {"users": USERS}}).encode()
+    users = list(serve(body).fetch_users())
+    assert [user.user_id for user in users] == ["1", "2"]
+
+
+@pytest.mark.parametrize("body", [
+    {"success": False, "message": "Token expired"},
+    {"success": False, "message": "Token expired", "data": {"users": USERS}},
+    {"data": {"users": USERS}, "success": False, "message": "Token expired"},
+])
+def test_failure_body_raises(workboard, serve, body):
+    provider = serve(json.dumps(body).encode())
+    with pytest.raises(workboard.APIError, match="Token expired"):
+        list(provider.fetch_users())
+
+
+@pytest.mark.parametrize("body", [
+    b"<html>",
+    b"",
+    b'{"success": true, "data": {"users": [{"user_id": 1',
+])
+def test_malformed_body_raises_api_error(workboard, serve, body):
+    provider = serve(body)
+    with pytest.raises(workboard.APIError):
+        list(provider.fetch_users())
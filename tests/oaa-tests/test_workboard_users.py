@@ -0,0 +1,76 @@
+"""Check that WorkBoard users are fetched once per sync."""
+import json
+import threading
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+
+class FakeAPI:
+    """Stands in for WorkBoardOAAProvider._send, counting requests per endpoint."""
+
+    def __init__(self, current_user="1"):
+        self.current_user = current_user
+        self.titles = {}  # title returned for each user id
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def __call__(self, method, endpoint, **kwargs):
+        with self._lock:
+            self.requests.append(endpoint)
+        user_id = endpoint[len("user/"):] or self.current_user
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"success": True, "data": {"user": {
+            "user_id": int(user_id),
+            "email": f"user{user_id}@example.com",
+            "first_name": "User",
+            "last_name": user_id,
+            "profile": {"title": self.titles.get(user_id, "Engineer")}
+        }}}).encode()
+        return response
+
+
+@pytest.fixture
+def api(workboard_provider, monkeypatch):
+    api = FakeAPI()
+    monkeypatch.setattr(workboard_provider, "_send", api)
+    return api
+
+
+def test_fetch_user_is_cached(workboard_provider, api):
+    current = workboard_provider.fetch_user()
+    assert workboard_provider.fetch_user() is current
+    # The current user is also cached under its own ID
+    assert workboard_provider.fetch_user("1") is current
+    assert workboard_provider.fetch_user("2").user_id == "2"
+    assert workboard_provider.fetch_user("2").user_id == "2"
+
+    assert api.requests == ["user/", "user/2"]
+
+
+def test_fetch_users_by_id_requests_each_missing_user_once(workboard_provider, api):
+    workboard_provider.fetch_user()
+    users = workboard_provider.fetch_users_by_id(["2", "3", "2", "1", "3"])
+
+    assert [user.user_id for user in users] == ["2", "3", "2", "1", "3"]
+    assert users[0] is users[2]
+    assert sorted(api.requests) == ["user/", "user/2", "user/3"]
+
+    workboard_provider.fetch_users_by_id(["3", "1"])
+    assert len(api.requests) == 3
+
+
+def test_each_sync_fetches_users_again(workboard_provider, api, monkeypatch):
+    pushed = []
+    monkeypatch.setattr(workboard_provider, "_push_to_oaa", lambda **kwargs: pushed.append(kwargs["provider_data"]))
+
+    workboard_provider.sync()
+    # A change made between syncs is picked up by the next one
+    api.titles["1"] = "Admin"
+    workboard_provider.sync()
+
+    assert api.requests == ["user/", "user/"]
+    titles = [app.local_users["1"].properties["title"] for app in pushed]
+    assert titles == ["Engineer", "Admin"]
@@ -1,15 +1,37 @@
+import abc
 import os
 import sys
 import asyncio
 import aiohttp
+import functools
+import itertools
 import json
 import csv
+import time
 import argparse
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 import urllib.parse
+from yarl import URL
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Decoder for API responses
+json_loads = orjson.loads if orjson is not None else json.loads
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# aiohttp can only decode brotli responses when brotli is installed
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli is not None else 'gzip, deflate'
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +43,26 @@ logger = logging.getLogger(__name__)
 # Constants
 EXPORTS_DIR = "exports"
 MAX_LIMIT = 250
+DEFAULT_CONCURRENCY = 8
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 60  # seconds
+TOKEN_DEFAULT_EXPIRES_IN = 3600  # seconds, if the token response has no expires_in
+TOKEN_EXPIRY_BUFFER = 30  # seconds before expiry to refresh the token
+CSV_BUFFER_SIZE = 1 << 20  # bytes
+PROGRESS_LOG_PAGES = 10  # log progress every this many pages fetched one at a time
+CSV_FIELDNAMES = (
+    'id',
+    'name',
+    'nativeIdentity',
+    'sourceId',
+    'identityId',
+    'manuallyCorrelated',
+    'created',
+    'modified',
+    'uuid',
+    'disabled'
+)
+CSV_MISSING_VALUES = ('',) * len(CSV_FIELDNAMES)  # written for fields an account lacks
 
 def setup_argparse() -> argparse.ArgumentParser:
     """Set up command line argument parser with full help documentation"""
@@ -95,6 +137,11 @@ source.displayableName, source.authoritative, source.connectionType
                        type=str,
                        help='Sort results using comma-separated field names (see examples below)')
     
+    parser.add_argument('--concurrency',
+                       type=int,
+                       default=DEFAULT_CONCURRENCY,
+                       help=f'Max number of pages fetched in parallel (default: {DEFAULT_CONCURRENCY}, 1 fetches pages one at a time)')
+    
     parser.add_argument('--output-dir', 
                        type=str,
                        default=EXPORTS_DIR,
@@ -164,108 +211,340 @@ class EnvironmentValidator:
         )
 
 class SailPointClient:
-    def __init__(self, config: SailPointConfig):
+    def __init__(self, config: SailPointConfig, concurrency: int = DEFAULT_CONCURRENCY):
         self.config = config
+        self.concurrency = concurrency
+        self._token_url = config.token_url
+        self._accounts_url = f"{config.api_base_url}/v3/accounts"
+        self._page_url = ""  # set by prepare_query
+        self._page_query = ""
         self.access_token: Optional[str] = None
+        self.token_expiry: float = 0.0
         self.session: Optional[aiohttp.ClientSession] = None
+        self._refresh_lock = asyncio.Lock()
     
     async def __aenter__(self):
-        await self.ensure_token()
+        try:
+            await self.ensure_token()
+        except BaseException:
+            # __aexit__ is not called when entering fails
+            if self.session:
+                await self.session.close()
+            raise
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
     
-    async def ensure_token(self):
-        """Get OAuth token using client credentials"""
-        if self.session:
-            await self.session.close()
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the session shared by token and API requests"""
+        # One keep-alive connection per concurrent page request, reused across pages
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.concurrency,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=None, connect=10, sock_read=60),
+            headers={
+                'Accept': 'application/json',
+                # Account pages are large, compressible JSON; aiohttp decompresses them
+                'Accept-Encoding': ACCEPT_ENCODING
+            }
+        )
+    
+    def _token_valid(self, stale_token: Optional[str]) -> bool:
+        """Check whether the current token can be used instead of fetching a new one"""
+        return (
+            self.access_token is not None
+            and self.access_token != stale_token
+            and time.monotonic() < self.token_expiry
+        )
+    
+    async def ensure_token(self, stale_token: Optional[str] = None):
+        """
+        Get OAuth token using client credentials, unless the current one is still valid
+        
+        stale_token: a token the API rejected; it is replaced even if not yet expired.
+        Concurrent callers share a single refresh.
+        """
+        if self._token_valid(stale_token):
+            return
             
-        async with aiohttp.ClientSession() as session:
-            # Prepare form data
-            data = aiohttp.FormData()
-            data.add_field('grant_type', self.config.grant_type)
-            data.add_field('client_id', self.config.client_id)
-            data.add_field('client_secret', self.config.client_secret)
+        async with self._refresh_lock:
+            # Another caller may have refreshed while we waited
+            if self._token_valid(stale_token):
+                return
+                
+            if self.session is None:
+                self.session = self._create_session()
+                
+            # Three plain fields; a prebuilt urlencoded body skips FormData's field handling
+            data = urllib.parse.urlencode({
+                'grant_type': self.config.grant_type,
+                'client_id': self.config.client_id,
+                'client_secret': self.config.client_secret
+            }).encode()
             
             headers = {
                 'Accept': 'application/json',
+                'Content-Type': 'application/x-www-form-urlencoded',
                 'scope': 'sp:scope:all'
             }
             
-            async with session.post(
-                self.config.token_url,
+            async with self.session.post(
+                self._token_url,
                 data=data,
                 headers=headers,
                 ssl=True
             ) as response:
                 response.raise_for_status()
-                token_data = await response.json()
+                token_data = await response.json(loads=json_loads)
                 self.access_token = token_data['access_token']
-                
-        # Create new session with token
-        self.session = aiohttp.ClientSession(
-            headers={
-                'Authorization': f'Bearer {self.access_token}',
-                'Accept': 'application/json'
-            }
-        )
+                expires_in = token_data.get('expires_in', TOKEN_DEFAULT_EXPIRES_IN)
+                self.token_expiry = time.monotonic() + expires_in - TOKEN_EXPIRY_BUFFER
     
     async def get_accounts(self, limit: int = 250, offset: int = 0, 
-                         count: bool = True, filters: str = None, 
-                         sorters: str = None) -> Dict:
+                         count: bool = True, filters: Optional[str] = None, 
+                         sorters: Optional[str] = None) -> Dict:
         """Get accounts with full query parameter support"""
-        params = {
-            'limit': min(limit, MAX_LIMIT),
-            'offset': offset,
-            'count': str(count).lower()
-        }
-        
-        if filters:
-            params['filters'] = filters
-        
-        if sorters:
-            params['sorters'] = sorters
-            
-        url = f"{self.config.api_base_url}/v3/accounts"
+        query = f"limit={min(limit, MAX_LIMIT)}&offset={offset}&count={str(count).lower()}"
+        shared_query = encode_shared_query(filters, sorters)
+        if shared_query:
+            query = f"{query}&{shared_query}"
+        # The query is already encoded; don't let aiohttp quote it again
+        return await self._fetch_accounts(URL(f"{self._accounts_url}?{query}", encoded=True), count)
+    
+    def prepare_query(self, limit: int = 250, filters: Optional[str] = None, sorters: Optional[str] = None):
+        """Set the query parameters that stay the same for every page fetched with get_page"""
+        # Everything after the offset parameter; count is always false for these pages
+        self._page_query = f"&count=false&{encode_shared_query(filters, sorters)}".rstrip('&')
+        self._page_url = f"{self._accounts_url}?limit={min(limit, MAX_LIMIT)}&offset="
+    
+    async def get_page(self, offset: int) -> Dict:
+        """Get one page of accounts using the query set by prepare_query"""
+        return await self._fetch_accounts(URL(f"{self._page_url}{offset}{self._page_query}", encoded=True), False)
+    
+    async def _fetch_accounts(self, url: URL, count: bool) -> Dict:
+        """Fetch a page of accounts, refreshing the token once if the API rejects it"""
+        await self.ensure_token()
+        token = self.access_token
+        assert token is not None  # set by ensure_token
+        try:
+            return await self._get_page(url, token, count)
+        except aiohttp.ClientResponseError as e:
+            if e.status not in (401, 403):
+                raise
+            # Token was revoked or expired early; refresh and retry once
+            await self.ensure_token(stale_token=token)
+            assert self.access_token is not None
+            return await self._get_page(url, self.access_token, count)
+    
+    async def _get_page(self, url: URL, token: str, count: bool) -> Dict:
+        """
+        Fetch one page of accounts with the given access token
         
-        async with self.session.get(url, params=params) as response:
+        total is None unless count was requested and SailPoint sent X-Total-Count.
+        """
+        headers = {'Authorization': f'Bearer {token}'}
+        async with self.session.get(url, headers=headers) as response:
             response.raise_for_status()
-            items = await response.json()
+            items = await response.json(loads=json_loads)
+            total = response.headers.getone('X-Total-Count', None) if count else None
             return {
-                'total': int(response.headers.get('X-Total-Count', len(items))),
+                'total': int(total) if total is not None else None,
                 'items': items
             }
 
-def save_to_json(data: List[Dict], filename: str):
-    """Save data to JSON file"""
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
-    logger.info(f"Saved JSON data to {filename}")
+@functools.lru_cache(maxsize=None)
+def encode_shared_query(filters: Optional[str], sorters: Optional[str]) -> str:
+    """URL-encode the filters and sorters, which are the same for every page of an export"""
+    params = {}
+    if filters:
+        params['filters'] = filters
+    if sorters:
+        params['sorters'] = sorters
+    return urllib.parse.urlencode(params)
 
-def save_to_csv(data: List[Dict], filename: str):
-    """Save data to CSV file"""
-    fieldnames = [
-        'id', 
-        'name',
-        'nativeIdentity',
-        'sourceId',
-        'identityId',
-        'manuallyCorrelated',
-        'created',
-        'modified',
-        'uuid',
-        'disabled'
-    ]
+class AccountWriter(abc.ABC):
+    """
+    Writes accounts to the export file page by page, so the export is never held in memory
+    
+    The file is only created once there are accounts to write. If the export fails
+    part way, the incomplete file is removed.
+    """
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.count = 0
+        self._file: Any = None  # opened by _open once there are accounts to write
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._file is None:
+            return
+        if exc_type is None:
+            self._finish()
+        self._file.close()
+        if exc_type is None:
+            logger.info(f"Saved {self.format_name} data to {self.filename}")
+        else:
+            os.remove(self.filename)
+    
+    def prepare(self, accounts: List[Dict]) -> List:
+        """Reduce a fetched page to what write needs, so less is held while pages wait"""
+        return accounts
+    
+    def write(self, accounts: List):
+        """Append a page of accounts, as returned by prepare, to the file"""
+        if not accounts:
+            return
+        if self._file is None:
+            self._file = self._open()
+        self._write(accounts)
+        self.count += len(accounts)
+    
+    @abc.abstractmethod
+    def _open(self):
+        """Open the output file and write anything that precedes the first page"""
+    
+    @abc.abstractmethod
+    def _write(self, accounts: List):
+        """Write a non-empty page to the open file"""
+    
+    def _finish(self):
+        pass
+
+class JSONAccountWriter(AccountWriter):
+    """Writes an indented JSON array, encoding with orjson when it is installed"""
+    format_name = 'JSON'
+    
+    if orjson is not None:
+        @staticmethod
+        def _encode(account: Dict) -> bytes:
+            return orjson.dumps(account, option=orjson.OPT_INDENT_2)
+    else:
+        @staticmethod
+        def _encode(account: Dict) -> bytes:
+            return json.dumps(account, indent=2).encode()
+    
+    def _open(self):
+        return open(self.filename, 'wb')
+    
+    def _write(self, accounts: List[Dict]):
+        # Indent each account one level to match dumping the whole list at once
+        parts = [self._encode(account).replace(b'\n', b'\n  ') for account in accounts]
+        self._file.write((b',\n  ' if self.count else b'[\n  ') + b',\n  '.join(parts))
+    
+    def _finish(self):
+        self._file.write(b'\n]')
 
-    with open(filename, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-        writer.writeheader()
-        for account in data:
-            row = {field: account.get(field, '') for field in fieldnames}
-            writer.writerow(row)
-    logger.info(f"Saved CSV data to {filename}")
+class CSVAccountWriter(AccountWriter):
+    """Writes one CSV row per account"""
+    format_name = 'CSV'
+    
+    def _open(self):
+        csvfile = open(self.filename, 'w', newline='', buffering=CSV_BUFFER_SIZE, encoding='utf-8')
+        self._writer = csv.writer(csvfile)
+        self._writer.writerow(CSV_FIELDNAMES)
+        return csvfile
+    
+    def prepare(self, accounts: List[Dict]) -> List[List]:
+        # Keep only the exported fields; map() looks them up in C
+        return [list(map(account.get, CSV_FIELDNAMES, CSV_MISSING_VALUES)) for account in accounts]
+    
+    def _write(self, rows: List[List]):
+        self._writer.writerows(rows)
+
+class WriteQueue:
+    """
+    Hands pages to an AccountWriter through a bounded queue, written by a single worker task
+    
+    The file is written on a worker thread while the next pages are fetched, and at most
+    maxsize pages wait in memory for the writer.
+    """
+    
+    def __init__(self, writer: AccountWriter, maxsize: int):
+        self.writer = writer
+        self.count = 0  # accounts queued so far
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._task: Optional[asyncio.Future] = None
+    
+    async def __aenter__(self):
+        self._task = asyncio.ensure_future(self._drain())
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        task = self._task
+        assert task is not None  # started by __aenter__
+        if not task.done():
+            if exc_type is not None:
+                # The export failed; drop the pages that were not written yet
+                while not self._queue.empty():
+                    self._queue.get_nowait()
+            await self._queue.put(None)
+        if exc_type is None:
+            await task  # raises if a write failed
+        else:
+            # Wait for the write in progress so the file can be closed safely
+            await asyncio.wait((task,))
+            if not task.cancelled():
+                task.exception()  # retrieved; the export error takes precedence
+    
+    async def put(self, accounts: List):
+        """Queue a page of accounts (as returned by AccountWriter.prepare) to be written"""
+        task = self._task
+        assert task is not None  # started by __aenter__
+        put = asyncio.ensure_future(self._queue.put(accounts))
+        await asyncio.wait((put, task), return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            # The writer stopped, so the queue will never drain
+            put.cancel()
+            task.result()
+        self.count += len(accounts)
+    
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            accounts = await self._queue.get()
+            if accounts is None:
+                return
+            # Write from a worker thread so the event loop is not blocked
+            # (asyncio.to_thread needs Python 3.9)
+            await loop.run_in_executor(None, self.writer.write, accounts)
+
+async def fetch_pages(fetch: Callable[[int], Awaitable[List]], offsets: Iterable[int],
+                      window: int, put: Callable[[List], Awaitable[None]]) -> Optional[Tuple[int, List]]:
+    """
+    Fetch pages concurrently and hand them to put in offset order
+    
+    At most window pages are requested ahead of the next page to put, and the next
+    offset is only requested once a page has been put, so a slow page holds back a
+    fixed number of pages rather than the rest of the export.
+    
+    Returns: the offset and items of the last page put, or None if there were no offsets
+    """
+    offsets = iter(offsets)
+    pending: Deque[Tuple[int, asyncio.Future]] = deque(
+        (o, asyncio.ensure_future(fetch(o))) for o in itertools.islice(offsets, window)
+    )
+    last = None
+    try:
+        while pending:
+            page_offset, task = pending.popleft()
+            last = (page_offset, await task)
+            await put(last[1])
+            for o in itertools.islice(offsets, 1):
+                pending.append((o, asyncio.ensure_future(fetch(o))))
+    finally:
+        for _, task in pending:
+            task.cancel()
+    return last
 
 async def main():
     parser = setup_argparse()
@@ -275,6 +554,10 @@ async def main():
     if args.limit > MAX_LIMIT:
         logger.warning(f"Limit {args.limit} exceeds maximum of {MAX_LIMIT}. Using {MAX_LIMIT}")
         args.limit = MAX_LIMIT
+    
+    if args.concurrency < 1:
+        logger.warning(f"Concurrency {args.concurrency} is below 1. Using 1")
+        args.concurrency = 1
 
     try:
         # Create exports directory if it doesn't exist
@@ -283,51 +566,69 @@ async def main():
         # Validate environment and get config
         config = EnvironmentValidator.validate()
         
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = os.path.join(args.output_dir, f"sailpoint_accounts_{timestamp}.{args.format}")
+        writer_class = JSONAccountWriter if args.format == 'json' else CSVAccountWriter
+        
         # Initialize client
-        async with SailPointClient(config) as client:
-            offset = args.offset
-            all_accounts = []
-            
-            # Get first batch
-            result = await client.get_accounts(
-                limit=args.limit,
-                offset=offset,
-                count=args.count,
-                filters=args.filters,
-                sorters=args.sorters
-            )
-            
-            current_batch = result['items']
-            all_accounts.extend(current_batch)
-            logger.info(f"Retrieved {len(current_batch)} accounts")
-            
-            # Fetch remaining pages if there are more items
-            while len(current_batch) == args.limit:  # If we got a full page, there might be more
-                offset += args.limit
-                result = await client.get_accounts(
-                    limit=args.limit,
-                    offset=offset,
-                    count=False,  # No need for count on subsequent pages
-                    filters=args.filters,
-                    sorters=args.sorters
-                )
-                current_batch = result['items']
-                all_accounts.extend(current_batch)
-                logger.info(f"Retrieved {len(all_accounts)} total accounts")
-            
-            # Only save file if we have results
-            if all_accounts:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = os.path.join(args.output_dir, f"sailpoint_accounts_{timestamp}.{args.format}")
-                
-                if args.format == 'json':
-                    save_to_json(all_accounts, filename)
-                else:  # csv
-                    save_to_csv(all_accounts, filename)
-                
-                logger.info(f"Export complete. Total accounts retrieved: {len(all_accounts)}")
-            else:
-                logger.info("No accounts found. No file was created.")
+        async with SailPointClient(config, concurrency=args.concurrency) as client:
+            with writer_class(filename) as writer:
+                async with WriteQueue(writer, maxsize=args.concurrency * 2) as pages:
+                    offset = args.offset
+                    concurrent = args.concurrency > 1
+                    
+                    # Get first batch; parallel fetching needs the total to plan the remaining pages
+                    result = await client.get_accounts(
+                        limit=args.limit,
+                        offset=offset,
+                        count=args.count or concurrent,
+                        filters=args.filters,
+                        sorters=args.sorters
+                    )
+                    
+                    current_batch = writer.prepare(result['items'])
+                    total = result['total']  # None unless the count header was requested and sent
+                    client.prepare_query(limit=args.limit, filters=args.filters, sorters=args.sorters)
+                    await pages.put(current_batch)
+                    logger.info("Retrieved %d accounts", len(current_batch))
+                    
+                    # Fetch the pages covered by the total count in parallel
+                    if concurrent and total is not None and len(current_batch) == args.limit:
+                        semaphore = asyncio.Semaphore(args.concurrency)
+                        
+                        async def fetch_page(page_offset: int) -> List:
+                            async with semaphore:
+                                page = await client.get_page(page_offset)
+                                return writer.prepare(page['items'])
+                        
+                        last = await fetch_pages(
+                            fetch_page,
+                            range(offset + args.limit, total, args.limit),
+                            window=args.concurrency * 2,
+                            put=pages.put
+                        )
+                        if last is not None:
+                            offset, current_batch = last
+                            # Logged once for all parallel pages
+                            logger.info("Retrieved %d total accounts", pages.count)
+                    
+                    # Fetch remaining pages one at a time. A full page means there might be more,
+                    # unless the total count shows this page reached the end.
+                    sequential_pages = 0
+                    while len(current_batch) == args.limit and (total is None or offset + len(current_batch) < total):
+                        offset += args.limit
+                        result = await client.get_page(offset)  # No need for count on subsequent pages
+                        current_batch = writer.prepare(result['items'])
+                        await pages.put(current_batch)
+                        sequential_pages += 1
+                        if sequential_pages % PROGRESS_LOG_PAGES == 0:
+                            logger.info("Retrieved %d total accounts", pages.count)
+        
+        # The writer only creates the file once it has results
+        if writer.count:
+            logger.info(f"Export complete. Total accounts retrieved: {writer.count}")
+        else:
+            logger.info("No accounts found. No file was created.")
             
     except ValueError as e:
         logger.error(str(e))
@@ -337,4 +638,15 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional; it speeds up the concurrent page fetches
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        if hasattr(uvloop, 'run'):
+            uvloop.run(main())
+        else:
+            # uvloop before 0.18 has no run(); install() is deprecated in later releases
+            uvloop.install()
+            asyncio.run(main())